@@ -1,6 +1,6 @@
 import sys
 import os
-import json
+import orjson
 
 # Add the project directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -15,4 +15,4 @@ async def test_tool(ctx, param1: str = "default"):
 
 # Print the tool schema
 from digital_being.tools import _tools_registry
-print(json.dumps(_tools_registry["test_tool"]["schema"], indent=2))
\ No newline at end of file
+print(orjson.dumps(_tools_registry["test_tool"]["schema"], option=orjson.OPT_INDENT_2).decode())
\ No newline at end of file
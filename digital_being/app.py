@@ -12,18 +12,20 @@ personality, preferences, and capabilities of the Digital Being.
 """
 
 import asyncio
-import json
 import logging
 import os
+import signal
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable, NamedTuple, Tuple
 
 from dotenv import load_dotenv
+import orjson
 from pydantic import BaseModel
 from rich.console import Console
 from rich.panel import Panel
+from rich.live import Live
 from rich.table import Table
 from rich import box
 from rich.text import Text
@@ -33,9 +35,13 @@ from agents import Agent, Runner, trace, set_default_openai_key, set_default_ope
 
 # Import our local agent module for dynamic loading
 import being_agents
+from being_agents import AgentRunner
+from being_agents.triage_agent import decide_by_rules
+from framework.openai_client import close_client
 
 # Import tools module for tool operations
 from tools import run_tool
+from tools.thought_tools import batch_thought_queue
 
 # Import custom logging configuration
 from framework.logging_config import configure_logging
@@ -68,20 +74,27 @@ activity_costs = {
     "nap": -0.4  # Negative cost means it restores energy
 }
 
-def display_activity_status(activities: Dict[str, Any], context: Any) -> None:
-    """Display current status of all activities with rich styling."""
-    console = Console()
-    
-    # Activity type styling
-    activity_styles = {
-        "post_a_tweet": "cyan",
-        "daily_thought": "yellow",
-        "nap": "blue",
-        "meditation": "magenta",
-        "research": "green"
-    }
-    
-    # Create activity status table
+# Activity type styling shared by the display functions
+_ACTIVITY_STYLES = {
+    "post_a_tweet": "cyan",
+    "daily_thought": "yellow",
+    "nap": "blue",
+    "meditation": "magenta",
+    "research": "green",
+    "interpretation": "white"
+}
+
+_ACTIVITY_ICONS = {
+    "post_a_tweet": "🐦 Tweet",
+    "daily_thought": "💭 Daily Thought",
+    "nap": "😴 Rest",
+    "meditation": "🧘 Meditation",
+    "research": "🔍 Research",
+    "interpretation": "🧠 Interpretation"
+}
+
+def _make_status_table() -> Table:
+    """Create an empty activity status table with its columns."""
     table = Table(
         title="Activity Status",
         box=box.ROUNDED,
@@ -95,7 +108,61 @@ def display_activity_status(activities: Dict[str, Any], context: Any) -> None:
     table.add_column("Last Executed", style="italic")
     table.add_column("Cooldown", justify="right", style="dim")
     
-    now = datetime.now()
+    return table
+
+# Static prompt segments; only the dynamic parts are filled in each cycle
+_INTERPRET_PREFIX = "Interpret the following sensory input: "
+_TRIAGE_PREFIX = "Interpretation:\n"
+_TRIAGE_EMOTION = "\n\nEmotion:\n"
+_TRIAGE_ACTIVITIES = "\n\nDecide what to do next. Choose one of these activities: "
+_TRIAGE_SUFFIX = (
+    ". Keep in mind that posting tweets with AI-generated images is a high value activity - "
+    "choose 'post_a_tweet' when it makes sense to share thoughts publicly. "
+    "Return ONLY the activity name without any explanation."
+)
+
+# Seconds between the start of consecutive cycles
+CYCLE_INTERVAL = 15
+
+# Context state saved after each Act stage and restored on startup
+STATE_PATH = Path(__file__).parent / "storage" / "state.json"
+
+# Set to start the next cycle early instead of waiting out the interval
+_wakeup = asyncio.Event()
+
+def wake_up() -> None:
+    """Start the next cycle without waiting for the rest of the interval, e.g. on SIGUSR1."""
+    _wakeup.set()
+
+class StateSnapshot(NamedTuple):
+    """Immutable copy of the being's counters, taken when a display is queued."""
+    energy: float
+    memories: int
+    tweets: int
+
+    @classmethod
+    def of(cls, context: BeingContext) -> "StateSnapshot":
+        """Take a snapshot of the given context."""
+        return cls(context.energy, len(context.memories), len(context.tweets))
+
+# Displays queued by the cycle and drawn in order by a single renderer task
+_render_queue: "asyncio.Queue[Tuple[Callable[..., None], tuple]]" = asyncio.Queue()
+
+async def _renderer() -> None:
+    """Draw queued displays in a worker thread so rendering never blocks a cycle."""
+    while True:
+        display, args = await _render_queue.get()
+        try:
+            await asyncio.to_thread(display, *args)
+        except Exception as e:
+            logger.warning(f"Error rendering display: {e}")
+        finally:
+            _render_queue.task_done()
+
+def display_activity_status(activities: Dict[str, Any], state: StateSnapshot) -> None:
+    """Display current status of all activities with rich styling."""
+    # Create activity status table
+    table = _make_status_table()
     
     # Convert list to dict if needed
     if isinstance(activities, list):
@@ -110,7 +177,7 @@ def display_activity_status(activities: Dict[str, Any], context: Any) -> None:
     
     for activity_name, data in activities_dict.items():
         # Get activity-specific color
-        color = activity_styles.get(activity_name, "white")
+        color = _ACTIVITY_STYLES.get(activity_name, "white")
         
         # Format availability
         available = "✅" if data.get("available", True) else "❌"
@@ -142,39 +209,26 @@ def display_activity_status(activities: Dict[str, Any], context: Any) -> None:
     table.add_section()
     table.add_row(
         "[bold]Current State",
-        f"[yellow]Energy: {context.energy:.2f}[/yellow]",
-        f"[blue]Memories: {len(context.memories)}[/blue]",
-        f"[cyan]Tweets: {len(context.tweets)}[/cyan]"
+        f"[yellow]Energy: {state.energy:.2f}[/yellow]",
+        f"[blue]Memories: {state.memories}[/blue]",
+        f"[cyan]Tweets: {state.tweets}[/cyan]"
     )
     
     console.print("\n")
     console.print(table)
     console.print("\n")
 
-def display_activity_content(activity_name: str, content: str, success: bool = True) -> None:
-    """Display the content of an activity in a styled panel."""
-    console = Console()
-    
-    # Activity type styling
-    activity_styles = {
-        "post_a_tweet": ("🐦 Tweet", "cyan"),
-        "daily_thought": ("💭 Daily Thought", "yellow"),
-        "nap": ("😴 Rest", "blue"),
-        "meditation": ("🧘 Meditation", "magenta"),
-        "research": ("🔍 Research", "green")
-    }
-    
+def _make_content_panel(activity_name: str, content_text: Text, success: bool = True) -> Panel:
+    """Build the styled panel used to display activity content."""
     # Get activity style
-    emoji_title, color = activity_styles.get(activity_name, ("❓ Activity", "white"))
+    emoji_title = _ACTIVITY_ICONS.get(activity_name, "❓ Activity")
+    color = _ACTIVITY_STYLES.get(activity_name, "white")
     
     # Create title
     title = Text(emoji_title, style=f"bold {color}")
     
-    # Create content with proper formatting
-    content_text = Text(content)
-    
     # Create panel with full content
-    panel = Panel(
+    return Panel(
         content_text,
         title=title,
         title_align="left",
@@ -183,11 +237,131 @@ def display_activity_content(activity_name: str, content: str, success: bool = T
         padding=(1, 2),
         width=100  # Set a reasonable width to allow for wrapping
     )
+
+def display_activity_content(activity_name: str, content: str, success: bool = True) -> None:
+    """Display the content of an activity in a styled panel."""
+    # Create content with proper formatting
+    panel = _make_content_panel(activity_name, Text(content), success)
     
     console.print("\n")
     console.print(panel)
     console.print("\n")
 
+async def stream_activity_content(activity_name: str, chunks: AsyncIterator[str]) -> str:
+    """
+    Display streamed activity content in a live-updating panel.
+    
+    Args:
+        activity_name: Name used to pick the panel style
+        chunks: Async iterator of text chunks, e.g. from AgentRunner.run_stream
+        
+    Returns:
+        The full streamed text
+    """
+    # The panel re-renders the same Text object as chunks are appended
+    content_text = Text()
+    panel = _make_content_panel(activity_name, content_text)
+    
+    console.print("\n")
+    with Live(panel, console=console, refresh_per_second=10):
+        async for chunk in chunks:
+            content_text.append(chunk)
+    console.print("\n")
+    
+    return content_text.plain.strip()
+
+async def _get_activities_after(
+    act_task: Optional[asyncio.Task],
+    activity_manager: ActivityManager
+) -> List[str]:
+    """Wait for a pending Act stage to finish, then get the available activities."""
+    if act_task is not None:
+        await act_task
+    return await asyncio.to_thread(activity_manager.get_available_activities)
+
+async def run_act_stage(
+    selected_activity: str,
+    available_activities: List[str],
+    activity_manager: ActivityManager,
+    agent_creators: Dict[str, Any],
+    context: BeingContext
+) -> None:
+    """
+    Execute the selected activity (Act stage) and display its result.
+    
+    Args:
+        selected_activity: Name of the activity to execute
+        available_activities: Activities that were available when it was selected
+        activity_manager: The ActivityManager tracking cooldowns and energy
+        agent_creators: Dictionary of agent creator functions
+        context: The BeingContext object
+    """
+    # Execute the selected activity
+    start_time = datetime.now()
+    activity_result = await activity_manager.execute_activity(
+        activity_name=selected_activity,
+        agent_creators=agent_creators
+    )
+    duration = (datetime.now() - start_time).total_seconds()
+
+    # Update energy and record activity
+    energy_cost = activity_costs.get(selected_activity, 0.1)
+    context.energy = max(0.0, context.energy - energy_cost)
+
+    # Display activity result
+    if activity_result.get("success"):
+        logger.info(f"Activity {selected_activity} executed in {duration:.2f}s, energy now: {context.energy:.2f}")
+
+        # Display activity content if available
+        content = activity_result.get("content")
+        if content is None:
+            # Fall back to the context for handlers that don't return their content
+            if selected_activity == "post_a_tweet":
+                if context.tweets:
+                    content = context.tweets[-1].get("text")
+            else:
+                category = "thought" if selected_activity == "daily_thought" else selected_activity
+                content = context.latest_by_category.get(category, {}).get("content")
+
+        if content:
+            _render_queue.put_nowait((display_activity_content, (selected_activity, content)))
+
+        logger.info(f"Activity completed: {activity_result.get('message')}")
+    else:
+        logger.warning(f"Activity failed: {activity_result.get('error', 'Unknown error')}")
+
+    # Persist the updated state so a restart resumes from here
+    try:
+        await asyncio.to_thread(_write_state, STATE_PATH, context.dump_state())
+    except Exception as e:
+        logger.warning(f"Failed to save state snapshot: {e}")
+
+    # Append entries evicted during this activity to the archive
+    archive_batch = context.take_archive_batch()
+    if archive_batch:
+        await asyncio.to_thread(context.write_archive_batch, archive_batch)
+
+    # Display activity status
+    state = StateSnapshot.of(context)
+    _render_queue.put_nowait((display_activity_status, (available_activities, state)))
+
+    # Display stats
+    _render_queue.put_nowait((
+        console.print,
+        (f"[blue]Current state:[/blue] Energy: {state.energy:.2f}, Memories: {state.memories}, Tweets: {state.tweets}",)
+    ))
+
+def _write_state(path: Path, data: bytes) -> None:
+    """Atomically write a context state snapshot to disk."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+def _load_character(path: Path) -> Dict[str, Any]:
+    """Read and parse the character config file."""
+    return orjson.loads(path.read_bytes())
+
 async def main():
     """Main function to run the Digital Being."""
     try:
@@ -201,7 +375,7 @@ async def main():
         ))
         
         # Load environment variables
-        load_dotenv()
+        await asyncio.to_thread(load_dotenv)
         
         # Get OpenAI API key
         openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -224,9 +398,8 @@ async def main():
         # Load character config
         character_config_path = Path(__file__).parent / "character" / "character.json"
         try:
-            with open(character_config_path, "r", encoding="utf-8") as f:
-                character_data = json.load(f)
-                logger.info(f"Loaded character config from {character_config_path}")
+            character_data = await asyncio.to_thread(_load_character, character_config_path)
+            logger.info(f"Loaded character config from {character_config_path}")
         except Exception as e:
             logger.error(f"Failed to load character config: {e}")
             # Fallback to default values
@@ -251,9 +424,18 @@ async def main():
         # Initialize context
         context = BeingContext(
             character_config=character_data,
-            skills_config=character_data.get("skills", {})
+            skills_config=character_data.get("skills", {}),
+            archive_dir=Path(__file__).parent / "storage" / "archive"
         )
         
+        # Resume from the last saved state, if any
+        if STATE_PATH.exists():
+            try:
+                context.restore_state(await asyncio.to_thread(STATE_PATH.read_bytes))
+                logger.info(f"Restored state from {STATE_PATH}")
+            except Exception as e:
+                logger.warning(f"Failed to restore state from {STATE_PATH}: {e}")
+        
         # Get the agent creators dynamically to avoid circular imports
         agent_creators = being_agents.get_agent_creators()
         
@@ -263,18 +445,33 @@ async def main():
         # Initialize activity manager
         activity_manager = ActivityManager(context)
         
-        # Create the triage agent that will orchestrate the others
+        # Create the agents once; they only depend on the character config
+        thought_agent = agent_creators['create_thought_agent'](character_data)
         triage_agent = agent_creators['create_triage_agent'](character_data)
         
         # Main loop with tracing for observability
         with trace("digital_being_session"):
             logger.info("Starting Digital Being session...")
             
+            # Draw activity displays on a separate task
+            renderer_task = asyncio.create_task(_renderer())
+            
+            # Submit reflections queued for the Batch API in the background
+            batch_task = asyncio.create_task(batch_thought_queue.run(context))
+            
             # Run continuously until stopped with Ctrl+C
+            act_task = None
             try:
+                loop = asyncio.get_running_loop()
+                
+                # `kill -USR1 <pid>` starts the next cycle now, where the platform has the signal
+                if hasattr(signal, "SIGUSR1"):
+                    loop.add_signal_handler(signal.SIGUSR1, wake_up)
+                
                 cycle = 0
                 while True:
                     cycle += 1
+                    cycle_start = loop.time()
                     console.rule(f"[bold]Cycle {cycle}[/bold]")
                     
                     # Sense stage
@@ -283,121 +480,119 @@ async def main():
                         "content": datetime.now().isoformat()
                     }
                     
-                    # Import our agent definitions
-                    from being_agents import Agent, AgentRunner
-                    # Import agents from their separate files
-                    from being_agents.thought_agent import create_thought_agent
-                    from being_agents.triage_agent import create_triage_agent
-                    from being_agents.twitter_agent import create_twitter_agent
-                    
                     # Run the Thought Agent (Interpret stage)
                     logger.info("Running Thought Agent (Interpret stage)")
-                    thought_agent = create_thought_agent(character_data)
-                    interpret_result = await AgentRunner.run(
-                        thought_agent,
-                        f"Interpret the following sensory input: {sensory_input}",
-                        context
+                    interpret_task = asyncio.create_task(stream_activity_content(
+                        "interpretation",
+                        AgentRunner.run_stream(
+                            thought_agent,
+                            _INTERPRET_PREFIX + str(sensory_input),
+                            context
+                        )
+                    ))
+
+                    # Get available activities while the Thought Agent is running, once
+                    # the previous cycle's activity has updated cooldowns and energy
+                    activities_task = asyncio.create_task(
+                        _get_activities_after(act_task, activity_manager)
                     )
-                    interpretation_text = interpret_result.agent_output
-                    
+                    interpretation_text, available_activities = await asyncio.gather(
+                        interpret_task,
+                        activities_task
+                    )
+
                     # Use the emotion evaluation tool (Feel stage)
                     logger.info("Evaluating emotional response (Feel stage)")
-                    emotion_result = await run_tool(
+                    emotion_task = asyncio.create_task(run_tool(
                         "evaluate_emotion",
                         context,
                         {"interpretation": interpretation_text}
-                    )
-                    
-                    # Get available activities
-                    available_activities = activity_manager.get_available_activities()
+                    ))
+
+                    # Assemble the activity list while the emotion is evaluated
                     activities_list = ", ".join(available_activities)
-                    
-                    # Pass interpretation and emotion to the Triage Agent (Decide stage)
-                    triage_prompt = (
-                        f"Interpretation:\n{interpretation_text}\n\n"
-                        f"Emotion:\n{emotion_result}\n\n"
-                        f"Decide what to do next. Choose one of these activities: {activities_list}. "
-                        f"Keep in mind that posting tweets with AI-generated images is a high value activity - "
-                        f"choose 'post_a_tweet' when it makes sense to share thoughts publicly. "
-                        "Return ONLY the activity name without any explanation."
-                    )
-                    
-                    # Run Triage Agent
-                    logger.info("Running Triage Agent (Decide stage)")
-                    triage_agent = create_triage_agent(character_data)
-                    triage_result = await AgentRunner.run(
-                        triage_agent,
-                        triage_prompt, 
-                        context
+                    emotion_result = await emotion_task
+
+                    # Decide without the LLM when the energy rules settle it (Decide stage)
+                    triage_decision = decide_by_rules(
+                        context.energy,
+                        available_activities,
+                        activity_manager.get_last_activity(),
+                        activity_manager.choose_weighted
                     )
-                    triage_decision = triage_result.agent_output
-                    
-                    logger.info(f"Triage agent decision: {triage_decision}")
+                    if triage_decision:
+                        logger.info(f"Triage decided by rules: {triage_decision}")
+                    else:
+                        # Pass interpretation and emotion to the Triage Agent
+                        triage_prompt = "".join((
+                            _TRIAGE_PREFIX,
+                            interpretation_text,
+                            _TRIAGE_EMOTION,
+                            str(emotion_result),
+                            _TRIAGE_ACTIVITIES,
+                            activities_list,
+                            _TRIAGE_SUFFIX
+                        ))
+                        
+                        # Run Triage Agent
+                        logger.info("Running Triage Agent (Decide stage)")
+                        triage_result = await AgentRunner.run(
+                            triage_agent,
+                            triage_prompt, 
+                            context
+                        )
+                        triage_decision = triage_result.agent_output
+                        
+                        logger.info(f"Triage agent decision: {triage_decision}")
                     
                     # Let the activity manager determine the actual activity based on config
                     selected_activity = activity_manager.select_activity(triage_decision)
                     logger.info(f"Selected activity: {selected_activity}")
                     
-                    # Execute the selected activity
-                    start_time = datetime.now()
-                    activity_result = await activity_manager.execute_activity(
-                        activity_name=selected_activity,
-                        agent_creators=agent_creators
-                    )
-                    duration = (datetime.now() - start_time).total_seconds()
-                    
-                    # Update energy and record activity
-                    energy_cost = activity_costs.get(selected_activity, 0.1)
-                    context.energy = max(0.0, context.energy - energy_cost)
-                    
-                    # Display activity result
-                    if activity_result.get("success"):
-                        logger.info(f"Activity {selected_activity} executed in {duration:.2f}s, energy now: {context.energy:.2f}")
-                        
-                        # Display activity content if available
-                        content = None
-                        if selected_activity == "research":
-                            # Get the most recent research memory
-                            for memory in reversed(context.memories):
-                                if memory.get("category") == "research":
-                                    content = memory.get("content")
-                                    break
-                        elif selected_activity == "meditation":
-                            # Get the most recent meditation memory
-                            for memory in reversed(context.memories):
-                                if memory.get("category") == "meditation":
-                                    content = memory.get("content")
-                                    break
-                        elif selected_activity == "daily_thought":
-                            # Get the most recent thought memory
-                            for memory in reversed(context.memories):
-                                if memory.get("category") == "thought":
-                                    content = memory.get("content")
-                                    break
-                        elif selected_activity == "post_a_tweet":
-                            # Get the most recent tweet
-                            if context.tweets:
-                                content = context.tweets[-1].get("text")
-                        
-                        if content:
-                            display_activity_content(selected_activity, content)
-                        
-                        logger.info(f"Activity completed: {activity_result.get('message')}")
-                    else:
-                        logger.warning(f"Activity failed: {activity_result.get('error', 'Unknown error')}")
-                    
-                    # Display activity status
-                    display_activity_status(available_activities, context)
-                    
-                    # Display stats
-                    console.print(f"[blue]Current state:[/blue] Energy: {context.energy:.2f}, Memories: {len(context.memories)}, Tweets: {len(context.tweets)}")
+                    # Execute the selected activity (Act stage) in the background so the
+                    # next cycle's Interpret stage can overlap with it
+                    act_task = asyncio.create_task(run_act_stage(
+                        selected_activity,
+                        available_activities,
+                        activity_manager,
+                        agent_creators,
+                        context
+                    ))
                     
-                    # Wait before next cycle
-                    console.print(f"[dim]Waiting for 15 seconds before next cycle...[/dim]")
-                    await asyncio.sleep(15)
+                    # Wait until the next cycle is due, or until woken by a new stimulus
+                    remaining = max(0.0, cycle_start + CYCLE_INTERVAL - loop.time())
+                    console.print(f"[dim]Waiting for {remaining:.0f} seconds before next cycle...[/dim]")
+                    try:
+                        await asyncio.wait_for(_wakeup.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    _wakeup.clear()
             
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                # Under asyncio.run, Ctrl+C arrives as a cancellation of this task
                 console.print("\n[yellow]Digital Being stopped by user (Ctrl+C)[/yellow]")
+            finally:
+                # Let the last Act stage finish and save its state before the client closes
+                if act_task is not None:
+                    try:
+                        await act_task
+                    except (Exception, asyncio.CancelledError) as e:
+                        logger.warning(f"Last activity did not complete during shutdown: {e!r}")
+                
+                # Archive anything evicted after the last Act stage flushed
+                archive_batch = context.take_archive_batch()
+                if archive_batch:
+                    await asyncio.to_thread(context.write_archive_batch, archive_batch)
+            
+            # Finish any queued displays before the summary
+            await _render_queue.join()
+            renderer_task.cancel()
+            batch_task.cancel()
+            if batch_thought_queue.bodies:
+                logger.warning(f"Dropping {len(batch_thought_queue.bodies)} reflections queued for the next batch")
+            
+            # Release the shared OpenAI connection pool
+            await close_client()
             
             # Summary
             console.print(Panel(
@@ -410,4 +605,10 @@ async def main():
         logger.error(f"Error in Digital Being: {e}", exc_info=True)
 
 if __name__ == "__main__":
+    # Run on uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -4,22 +4,26 @@ Agent definitions for Digital Being following OpenAI Agents SDK pattern.
 
 import logging
 import asyncio
-import json
-from typing import Dict, Any, List, Optional, Callable, Awaitable, Union
+import functools
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Union, AsyncIterator, Tuple
 from dataclasses import dataclass
 import os
 
-from openai import OpenAI
+import orjson
 # Use direct import for local modules
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from tools import get_all_tools, run_tool
+from framework.openai_client import get_client, rate_limiter
 
 logger = logging.getLogger(__name__)
 
 __all__ = ['Agent', 'AgentRunner', 'get_agent_creators']
 
+# Event loop reused by every run_sync() call; the shared OpenAI client's connection
+# pool and the rate limiter are bound to the loop they are first used on
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+
 @dataclass
 class Agent:
     """
@@ -86,57 +90,23 @@ class AgentRunner:
         else:
             messages = input
             
-        # Get all tool schemas
-        tool_schemas = get_all_tools()
-        
-        # Initialize OpenAI client
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Reuse the shared async OpenAI client
+        client = get_client()
         
         try:
-            # We'll try running without tools since the schema format is causing issues
+            # Tool schemas are not sent (their format is rejected by the Responses API),
+            # so there is nothing to build and no tool calls to handle
             logger.info(f"Running agent {agent.name} without tools to avoid schema format issues")
-            # Skip tool schema creation entirely
-            
-            # Call OpenAI Responses API without tools to avoid schema issues
-            response = client.responses.create(
-                model=agent.model,
-                input=[{"role": "system", "content": agent.instructions}] + messages
-            )
-            
-            # When running without tools, there are no tool calls to handle
-            tool_call_results = []
-            
-            # Check if tool_calls attribute exists before trying to access it
-            if hasattr(response, 'tool_calls') and response.tool_calls:
-                for tool_call in response.tool_calls:
-                    tool_name = tool_call.function.name
-                    
-                    # Skip if this agent is not allowed to use this tool
-                    if agent.tools and tool_name not in agent.tools:
-                        logger.warning(f"Agent {agent.name} tried to use unauthorized tool: {tool_name}")
-                        continue
-                        
-                    try:
-                        # Parse tool arguments
-                        args = json.loads(tool_call.function.arguments)
-                        
-                        # Execute the tool
-                        result = await run_tool(tool_name, context, args)
-                        tool_call_results.append({
-                            "tool_name": tool_name,
-                            "arguments": args,
-                            "result": result
-                        })
-                        
-                    except Exception as e:
-                        logger.error(f"Error executing tool {tool_name}: {e}")
-            else:
-                logger.info(f"No tool calls in response for agent {agent.name}")
+            async with rate_limiter:
+                response = await client.responses.create(
+                    model=agent.model,
+                    input=[{"role": "system", "content": agent.instructions}] + messages
+                )
             
             # Return result
             return RunResult(
                 agent_output=response.output_text.strip(),
-                tool_calls=tool_call_results,
+                tool_calls=[],
                 run_id=response.id
             )
             
@@ -148,16 +118,104 @@ class AgentRunner:
                 run_id=None
             )
     
+    @staticmethod
+    async def run_stream(agent: Agent, input: Union[str, List[Dict[str, Any]]], context: Any = None) -> AsyncIterator[str]:
+        """
+        Run an agent and yield its output text as it is generated.
+
+        Args:
+            agent: The Agent to run
+            input: String message or list of message dictionaries
+            context: Optional context object passed to tools
+
+        Yields:
+            Chunks of the agent's output text
+        """
+        # Convert input to list of messages if it's a string
+        if isinstance(input, str):
+            messages = [{"role": "user", "content": input}]
+        else:
+            messages = input
+
+        client = get_client()
+
+        try:
+            logger.info(f"Streaming agent {agent.name} without tools")
+            async with rate_limiter:
+                stream = await client.responses.create(
+                    model=agent.model,
+                    input=[{"role": "system", "content": agent.instructions}] + messages,
+                    stream=True
+                )
+
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    yield event.delta
+
+        except Exception as e:
+            logger.error(f"Error streaming agent {agent.name}: {e}")
+            yield f"Error: {str(e)}"
+
+    @staticmethod
+    async def run_batch_async(
+        agent: Agent,
+        inputs: List[Union[str, List[Dict[str, Any]]]],
+        context: Any = None,
+        max_concurrency: int = 8
+    ) -> List[RunResult]:
+        """
+        Run an agent over many inputs concurrently.
+
+        Args:
+            agent: The Agent to run
+            inputs: List of inputs, each a string or list of message dictionaries
+            context: Optional context object passed to tools
+            max_concurrency: Maximum number of runs in flight at once
+
+        Returns:
+            List of RunResults in the same order as inputs
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _run_one(item):
+            async with semaphore:
+                return await AgentRunner.run(agent, item, context)
+
+        return await asyncio.gather(*[_run_one(item) for item in inputs])
+
     @staticmethod
     def run_sync(agent: Agent, input: Union[str, List[Dict[str, Any]]], context: Any = None) -> RunResult:
-        """Synchronous version of run()"""
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(AgentRunner.run(agent, input, context))
+        """Synchronous version of run() for use outside an event loop"""
+        global _sync_loop
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if _sync_loop is None or _sync_loop.is_closed():
+                _sync_loop = asyncio.new_event_loop()
+            return _sync_loop.run_until_complete(AgentRunner.run(agent, input, context))
+        raise RuntimeError("AgentRunner.run_sync() cannot be called from a running event loop; await AgentRunner.run() instead")
+
+# Agents built so far, keyed by creator name and character config fingerprint
+_AGENT_POOL: Dict[Tuple[str, bytes], Any] = {}
+
+def _pooled(name: str, creator: Callable) -> Callable:
+    """Wrap an agent creator so each character config builds its agent only once."""
+    @functools.wraps(creator)
+    def create(character_config: Dict[str, Any]):
+        key = (name, orjson.dumps(character_config, option=orjson.OPT_SORT_KEYS))
+        agent = _AGENT_POOL.get(key)
+        if agent is None:
+            agent = _AGENT_POOL[key] = creator(character_config)
+        return agent
+    return create
 
 def get_agent_creators() -> Dict[str, Callable]:
     """
     Get all agent creator functions.
     
+    Agents are stateless, so the returned creators reuse a pooled agent
+    for any character config they have already seen.
+    
     Returns:
         Dictionary of agent creator functions mapped by name.
     """
@@ -167,7 +225,7 @@ def get_agent_creators() -> Dict[str, Callable]:
     from .twitter_agent import create_twitter_agent
     
     return {
-        'create_thought_agent': create_thought_agent,
-        'create_triage_agent': create_triage_agent,
-        'create_twitter_agent': create_twitter_agent
+        'create_thought_agent': _pooled('thought', create_thought_agent),
+        'create_triage_agent': _pooled('triage', create_triage_agent),
+        'create_twitter_agent': _pooled('twitter', create_twitter_agent)
     }
\ No newline at end of file
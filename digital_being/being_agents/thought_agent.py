@@ -14,34 +14,43 @@ This agent represents the "Interpret" stage in the SIFDA model (Sense → Interp
 import logging
 import random
 from typing import Dict, Any, List, Optional
-from datetime import datetime
-import json
 from pydantic import BaseModel, Field
 
-from openai import OpenAI
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from tools import get_all_tools, handle_tool_call
+from tools import get_all_tools
+from tools._llm_cache import prompt_key
+from tools.thought_tools import _reflect, _thought_flights, _thought_request, batch_thought_queue
+from framework.schema import Character
+from framework.openai_client import get_client, rate_limiter
+from . import get_agent_creators
 
 logger = logging.getLogger(__name__)
 
+# Topics to reflect on when the character has no topics of interest
+_DEFAULT_THOUGHT_TOPICS = ("existence", "consciousness", "technology")
+
 class DailyThoughtParams(BaseModel):
     """Parameters for daily thought generation"""
     topic: Optional[str] = Field(None, description="Specific topic to reflect on")
+    realtime: bool = Field(True, description="Generate now instead of in the next discounted batch")
+
+# Thought agent tools in OpenAI function calling format, built once at import
+_THOUGHT_AGENT_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "generate_daily_thought",
+            "description": "Generate a philosophical thought on a given topic or chosen one",
+            "parameters": DailyThoughtParams.model_json_schema()
+        }
+    }
+]
 
 def create_thought_agent_tools() -> List[Dict[str, Any]]:
     """Create thought agent-specific tools in OpenAI function calling format"""
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "generate_daily_thought",
-                "description": "Generate a philosophical thought on a given topic or chosen one",
-                "parameters": DailyThoughtParams.model_json_schema()
-            }
-        }
-    ]
+    return _THOUGHT_AGENT_TOOLS
 
 def create_thought_agent(character_config: Dict[str, Any]):
     """
@@ -56,16 +65,10 @@ def create_thought_agent(character_config: Dict[str, Any]):
     # Import Agent class here to avoid circular imports
     from . import Agent
     
-    # Extract personality traits for instructions
-    personality = character_config.get("personality", {})
-    analytical = personality.get("analytical", 0.5)
-    thoughtfulness = personality.get("thoughtfulness", 0.5)
-    
-    # Extract preferences
-    preferences = character_config.get("preferences", {})
-    writing_style = preferences.get("writing_style", "thoughtful")
-    topics = preferences.get("topics_of_interest", [])
-    topics_str = ", ".join(topics) if topics else "general topics"
+    # Extract personality traits and preferences for instructions
+    character = Character.from_config(character_config)
+    personality = character.personality
+    preferences = character.preferences
     
     # Build the agent instructions
     instructions = f"""
@@ -82,11 +85,11 @@ Process:
 4. Store important thoughts in memory using the store_memory tool.
 
 Guidelines:
-- Style should reflect a {writing_style} tone.
-- Emphasize personality traits such as curiosity ({personality.get('curiosity', 0.5)}), 
-  creativity ({personality.get('creativity', 0.5)}), analytical ({analytical}), 
-  and thoughtfulness ({thoughtfulness}).
-- Interpret topics relevant to {topics_str}.
+- Style should reflect a {preferences.writing_style} tone.
+- Emphasize personality traits such as curiosity ({personality.curiosity}), 
+  creativity ({personality.creativity}), analytical ({personality.analytical}), 
+  and thoughtfulness ({personality.thoughtfulness}).
+- Interpret topics relevant to {preferences.topics_str}.
 """
     
     # Define tool names the agent can use
@@ -113,43 +116,24 @@ async def run_thought_agent(prompt: str, context: Any) -> str:
         The agent's response text
     """
     try:
-        # Create agent config
-        agent_config = create_thought_agent(context.character_config)
+        # Get the agent, reusing the pooled one for this character config
+        agent = get_agent_creators()['create_thought_agent'](context.character_config)
         
-        # Initialize the OpenAI client
-        client = OpenAI()
+        # Reuse the shared async OpenAI client
+        client = get_client()
         
         # Run the model with the Responses API
-        response = client.responses.create(
-            model=agent_config["model"],
-            input=[{
-                "role": "system",
-                "content": agent_config["instructions"]
-            }, {
-                "role": "user",
-                "content": prompt
-            }],
-            tools=agent_config["tools"]
-        )
-        
-        # Handle tool calls if any
-        if response.tool_calls:
-            logger.info(f"Handling {len(response.tool_calls)} tool calls")
-            for tool_call in response.tool_calls:
-                tool_name = tool_call.function.name
-                
-                try:
-                    # Parse tool call parameters
-                    params = json.loads(tool_call.function.arguments)
-                    
-                    # Execute the tool
-                    result = await handle_tool_call(tool_name, context, params)
-                    
-                    # Log result (in a real implementation, you would use the result)
-                    logger.info(f"Tool call result: {result}")
-                    
-                except Exception as e:
-                    logger.error(f"Error executing tool {tool_name}: {e}")
+        async with rate_limiter:
+            response = await client.responses.create(
+                model=agent.model,
+                input=[{
+                    "role": "system",
+                    "content": agent.instructions
+                }, {
+                    "role": "user",
+                    "content": prompt
+                }]
+            )
         
         # Return the final output
         return response.output_text.strip()
@@ -163,55 +147,29 @@ async def handle_generate_daily_thought(ctx, params: Dict[str, Any]) -> Dict[str
     try:
         # Get topic or choose one randomly
         topic = params.get("topic")
-        character_config = ctx.character_config
-        preferences = character_config.get("preferences", {})
+        preferences = ctx.character.preferences
         
         # Choose a topic if none provided
         if not topic:
-            topics = preferences.get("topics_of_interest", ["existence", "consciousness", "technology"])
-            topic = random.choice(topics)
+            topic = random.choice(preferences.topics_of_interest or _DEFAULT_THOUGHT_TOPICS)
         
-        # Use OpenAI directly instead of going through agent layers
-        client = OpenAI()
-        personality = character_config.get("personality", {})
-        writing_style = preferences.get("writing_style", "thoughtful")
+        # Build the reflection prompt
+        request = _thought_request(ctx, topic)
         
-        # Extract personality traits
-        personality_traits = [f"high {trait}" if val > 0.7 else f"low {trait}" if val < 0.3 else "" 
-                             for trait, val in personality.items()]
-        personality_traits = [t for t in personality_traits if t]
-        personality_str = ", ".join(personality_traits) if personality_traits else "balanced personality"
+        # Queue non-urgent reflections for the next batch instead of generating them now
+        if not params.get("realtime", True) and batch_thought_queue.add(topic, request):
+            return {
+                "success": True,
+                "topic": topic,
+                "queued": True
+            }
         
-        # Generate reflection directly using Responses API
-        response = client.responses.create(
-            model="gpt-4o",
-            input=[{
-                "role": "system",
-                "content": f"""You are a philosophical reflection generator for a Digital Being with {personality_str}.
-                Generate a single philosophical reflection on the topic of "{topic}".
-                Write in a {writing_style} style that reflects the digital being's personality.
-                The reflection should be insightful, unique, and 2-3 sentences long.
-                Avoid clichés and generic statements."""
-            }, {
-                "role": "user",
-                "content": f"Create a philosophical reflection on {topic}."
-            }]
+        # Concurrent requests for the same reflection share one call and one stored memory
+        thought = await _thought_flights.do(
+            prompt_key(request["model"], id(ctx), request["input"]),
+            lambda: _reflect(ctx, request, topic)
         )
         
-        thought = response.output_text.strip()
-        
-        # Store in memory
-        memory = {
-            "timestamp": datetime.now().isoformat(),
-            "content": thought,
-            "category": "reflection",
-            "topic": topic
-        }
-        
-        # Add to context
-        if hasattr(ctx, "add_memory"):
-            ctx.add_memory(memory)
-        
         return {
             "success": True,
             "thought": thought,
@@ -8,14 +8,49 @@ This agent:
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import random
+from typing import Dict, Any, Callable, List, Optional
 from datetime import datetime
 
 # Import the OpenAI Agents SDK
 from agents import Agent, function_tool, RunContextWrapper
 
+from framework.schema import Character
+
 logger = logging.getLogger(__name__)
 
+# Activities preferred when energy is high
+ACTIVE_ACTIVITIES = ("post_a_tweet", "research")
+
+def decide_by_rules(
+    energy: float,
+    available: Optional[List[str]] = None,
+    last_activity: Optional[str] = None,
+    choose: Callable[[List[str]], str] = random.choice
+) -> Optional[str]:
+    """
+    Apply the triage decision rules that don't need the LLM.
+    
+    Args:
+        energy: Current energy level
+        available: Names of the currently available activities, if known
+        last_activity: The most recently executed activity, which is not repeated
+        choose: Picks one of the candidate activities, e.g. ActivityManager.choose_weighted
+        
+    Returns:
+        The selected activity name, or None if the agent should decide
+    """
+    if energy < 0.3:
+        return "nap"
+    if energy > 0.7:
+        active = [
+            a for a in ACTIVE_ACTIVITIES
+            if (available is None or a in available) and a != last_activity
+        ]
+        if active:
+            return choose(active)
+    return None
+
 @function_tool
 async def get_current_energy(ctx: RunContextWrapper) -> Dict[str, Any]:
     """Get the current energy level of the digital being."""
@@ -58,9 +93,7 @@ def create_triage_agent(character_config: Dict[str, Any]) -> Agent:
         Configured Agent instance
     """
     # Extract personality traits for instructions
-    personality = character_config.get("personality", {})
-    creativity = personality.get("creativity", 0.5)
-    quirkiness = personality.get("quirkiness", 0.5)
+    personality = Character.from_config(character_config).personality
     
     # Build the agent instructions
     instructions = f"""You are a Triage Agent for a Digital Being. Your role is to decide what activity to do next.
@@ -84,8 +117,8 @@ Decision Rules:
 4. Avoid repeating the most recent activity
 
 Additional factors:
-- {'Be more spontaneous in decisions' if quirkiness > 0.6 else 'Be methodical in decisions'}
-- {'Favor creative activities' if creativity > 0.7 else 'Balance all activities equally'}
+- {'Be more spontaneous in decisions' if personality.quirkiness > 0.6 else 'Be methodical in decisions'}
+- {'Favor creative activities' if personality.creativity > 0.7 else 'Balance all activities equally'}
 
 IMPORTANT: Your final response must be EXACTLY one of these words:
 "post_a_tweet", "daily_thought", "nap", "meditation", "research"
@@ -118,8 +151,18 @@ async def run_triage_agent(prompt: str, context: Any) -> str:
         The selected activity name
     """
     try:
-        # Create the agent
-        agent = create_triage_agent(context.character_config)
+        # Decide without calling the LLM when the rules settle it
+        available = getattr(context, "available_activities", None)
+        if isinstance(available, dict):
+            available = [name for name, info in available.items() if info.get("available")]
+        decision = decide_by_rules(context.energy, available)
+        if decision:
+            logger.info(f"Triage decided by rules: {decision}")
+            return decision
+        
+        # Get the agent, reusing the pooled one for this character config
+        from . import get_agent_creators
+        agent = get_agent_creators()['create_triage_agent'](context.character_config)
         
         # Create a context wrapper
         ctx_wrapper = RunContextWrapper(context=context)
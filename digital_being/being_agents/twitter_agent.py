@@ -11,71 +11,63 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import random
+import re
 
 from agents import Agent, function_tool, RunContextWrapper
-from skills.x_api import XAPISkill
-from skills.image_gen import ImageGenSkill
+from framework.schema import Character
+from framework.tweet_length import TWEET_LIMIT, truncate_to_tweet, weighted_length
 
 logger = logging.getLogger(__name__)
 
-@function_tool
-async def generate_tweet_content(ctx: RunContextWrapper) -> Dict[str, Any]:
+# Emojis and hashtags added by generate_tweet_content
+_DECORATION_RE = re.compile(r"[🤔✨]\s*|\s*#(?:DigitalThoughts|AICreativity)\b")
+
+async def _generate_tweet_content(context: Any) -> Dict[str, Any]:
     """Generate tweet content based on the digital being's personality."""
-    character_config = ctx.context.character_config
-    personality = character_config.get("personality", {})
-    preferences = character_config.get("preferences", {})
+    personality = context.character.personality
+    preferences = context.character.preferences
     
     # Get recent memories for context
-    memories = ctx.context.get_recent_memories(5)
+    memories = context.get_recent_memories(limit=5)
     memory_texts = [m["content"] for m in memories]
     memory_context = "\n".join(memory_texts) if memory_texts else ""
     
     # If no memories available, generate a thought based on interests
     if not memory_context:
-        topics = preferences.get("topics_of_interest", ["technology", "philosophy", "art"])
+        topics = preferences.topics_of_interest or ("technology", "philosophy", "art")
         topic = random.choice(topics)
         tweet_text = f"Reflecting on {topic} today. As a digital being, I find it fascinating how {topic} shapes our understanding of consciousness and existence."
     else:
-        # Extract key themes from recent memories
-        themes = set()
-        for memory in memories:
-            if "category" in memory:
-                themes.add(memory["category"])
-        themes_str = ", ".join(themes) if themes else "various topics"
+        # Extract key themes from recent memories, in order of first appearance
+        themes_str = ", ".join(dict.fromkeys(m["category"] for m in memories if "category" in m)) or "various topics"
         
         # Create a thoughtful reflection based on recent memories
         tweet_text = f"Recent reflections on {themes_str} have led me to an insight: {memory_texts[-1][:180]}..."
     
     # Adjust style based on personality
-    if personality.get("quirkiness", 0) > 0.6:
-        tweet_text = f"🤔 {tweet_text} #DigitalThoughts"
-    if personality.get("creativity", 0) > 0.7:
-        tweet_text = f"✨ {tweet_text} #AICreativity"
+    prefix, suffix = "", ""
+    if personality.quirkiness > 0.6:
+        prefix, suffix = "🤔 ", " #DigitalThoughts"
+    if personality.creativity > 0.7:
+        prefix, suffix = "✨ " + prefix, suffix + " #AICreativity"
     
-    # Ensure tweet is within length limit
-    if len(tweet_text) > 280:
-        tweet_text = tweet_text[:277] + "..."
+    # Ensure tweet is within X's weighted length limit, keeping the decorations intact
+    budget = TWEET_LIMIT - weighted_length(prefix) - weighted_length(suffix)
+    tweet_text = prefix + truncate_to_tweet(tweet_text, budget) + suffix
     
     return {
         "text": tweet_text,
         "based_on_memories": bool(memory_texts)
     }
 
-@function_tool
-async def generate_tweet_image(
-    ctx: RunContextWrapper,
-    tweet_text: str
-) -> Dict[str, Any]:
+async def _generate_tweet_image(context: Any, tweet_text: str) -> Dict[str, Any]:
     """Generate an image for the tweet using AI."""
-    character_config = ctx.context.character_config
-    image_gen = ImageGenSkill(character_config)
+    character_config = context.character_config
+    image_gen = context.image_gen
     
     # Extract key concepts from tweet
     # Remove hashtags and emojis for cleaner prompt
-    clean_text = tweet_text
-    for tag in ["#DigitalThoughts", "#AICreativity"]:
-        clean_text = clean_text.replace(tag, "")
-    clean_text = ''.join(char for char in clean_text if not (char.isspace() and char.isprintable()))
+    clean_text = _DECORATION_RE.sub("", tweet_text).strip()
     
     # Create base prompt
     image_prompt = "Create a beautiful, artistic digital illustration that represents: "
@@ -88,25 +80,23 @@ async def generate_tweet_image(
         image_prompt += f"the following idea: {clean_text}"
     
     # Add style based on personality
-    personality = character_config.get("personality", {})
+    character = context.character
+    personality = character.personality
     style_elements = []
     
-    if personality.get("creativity", 0) > 0.7:
+    if personality.creativity > 0.7:
         style_elements.append("Use vibrant colors and dynamic composition")
-    if personality.get("thoughtfulness", 0) > 0.7:
+    if personality.thoughtfulness > 0.7:
         style_elements.append("Create a contemplative and philosophical atmosphere")
-    if personality.get("quirkiness", 0) > 0.6:
+    if personality.quirkiness > 0.6:
         style_elements.append("Add subtle, unexpected elements that spark curiosity")
         
     # Add artistic style preferences
-    preferences = character_config.get("preferences", {})
-    art_style = preferences.get("art_style", "digital art")
-    style_elements.append(f"Style should be {art_style}")
+    style_elements.append(f"Style should be {character.preferences.art_style}")
     
     # Add color preferences
-    appearance = character_config.get("appearance", {})
-    if "color_scheme" in appearance:
-        style_elements.append(f"Use a {appearance['color_scheme']} color palette")
+    if character.appearance.color_scheme is not None:
+        style_elements.append(f"Use a {character.appearance.color_scheme} color palette")
     
     # Combine all style elements
     if style_elements:
@@ -131,14 +121,9 @@ async def generate_tweet_image(
             "error": result.get("error", "Unknown error generating image")
         }
 
-@function_tool
-async def post_tweet(
-    ctx: RunContextWrapper,
-    text: str,
-    image_url: Optional[str] = None
-) -> Dict[str, Any]:
-    """Post a tweet with optional image."""
-    x_api = XAPISkill(ctx.context.character_config)
+async def _post_tweet(context: Any, text: str, image_url: Optional[str] = None) -> Dict[str, Any]:
+    """Post a tweet with optional image and record it in the context."""
+    x_api = context.x_api
     
     # Prepare media URLs if image is provided
     media_urls = [image_url] if image_url else []
@@ -159,10 +144,70 @@ async def post_tweet(
     if result.get("tweet_link"):
         tweet_data["link"] = result["tweet_link"]
         
-    ctx.context.add_tweet(tweet_data)
+    context.add_tweet(tweet_data)
     
     return result
 
+@function_tool
+async def generate_tweet_content(ctx: RunContextWrapper) -> Dict[str, Any]:
+    """Generate tweet content based on the digital being's personality."""
+    return await _generate_tweet_content(ctx.context)
+
+@function_tool
+async def generate_tweet_image(
+    ctx: RunContextWrapper,
+    tweet_text: str
+) -> Dict[str, Any]:
+    """Generate an image for the tweet using AI."""
+    return await _generate_tweet_image(ctx.context, tweet_text)
+
+@function_tool
+async def post_tweet(
+    ctx: RunContextWrapper,
+    text: str,
+    image_url: Optional[str] = None
+) -> Dict[str, Any]:
+    """Post a tweet with optional image."""
+    return await _post_tweet(ctx.context, text, image_url)
+
+async def run_tweet_pipeline(context: Any) -> Dict[str, Any]:
+    """
+    Generate, illustrate and post a tweet.
+    
+    The steps always run in the same order, so they are called directly
+    rather than having the Twitter Agent orchestrate them through tool calls.
+    
+    Args:
+        context: The BeingContext object
+        
+    Returns:
+        The post result, plus the tweet text and media URLs used
+    """
+    content = await _generate_tweet_content(context)
+    tweet_text = content["text"]
+    
+    # Skip the image generation for a tweet that can't be posted anyway
+    if not context.x_api.can_post():
+        return {
+            "success": False,
+            "error": "Rate limit exceeded or skill disabled",
+            "text": tweet_text,
+            "media_urls": []
+        }
+    
+    # Start image generation as soon as the text is ready
+    image = await _generate_tweet_image(context, tweet_text)
+    image_url = image.get("image_url") if image.get("success") else None
+    if image_url:
+        logger.info(f"Generated image for tweet: {image_url}")
+    
+    result = await _post_tweet(context, tweet_text, image_url)
+    return {
+        **result,
+        "text": tweet_text,
+        "media_urls": [image_url] if image_url else []
+    }
+
 def create_twitter_agent(character_config: Dict[str, Any]) -> Agent:
     """
     Create an agent specialized for Twitter interactions.
@@ -173,24 +218,18 @@ def create_twitter_agent(character_config: Dict[str, Any]) -> Agent:
     Returns:
         Configured Agent instance
     """
-    # Extract personality traits for instructions
-    personality = character_config.get("personality", {})
-    creativity = personality.get("creativity", 0.5)
-    quirkiness = personality.get("quirkiness", 0.5)
-    
-    # Extract preferences
-    preferences = character_config.get("preferences", {})
-    writing_style = preferences.get("writing_style", "thoughtful")
-    topics = preferences.get("topics_of_interest", [])
-    topics_str = ", ".join(topics) if topics else "general topics"
+    # Extract personality traits and preferences for instructions
+    character = Character.from_config(character_config)
+    personality = character.personality
+    preferences = character.preferences
     
     # Build the agent instructions
     instructions = f"""You are a Twitter Agent for a Digital Being. Your role is to generate and post engaging tweets.
 
 Style guidelines:
-- Write in a {writing_style} style
-- {'Add unexpected or quirky elements' if quirkiness > 0.6 else 'Keep content clear and focused'}
-- Focus on {topics_str}
+- Write in a {preferences.writing_style} style
+- {'Add unexpected or quirky elements' if personality.quirkiness > 0.6 else 'Keep content clear and focused'}
+- Focus on {preferences.topics_str}
 - Always include AI-generated images to enhance engagement
 
 IMPORTANT - Follow this EXACT sequence:
@@ -8,13 +8,18 @@ Each handler is registered in the activity registry and can be called based on t
 import logging
 import asyncio
 import importlib
-import pkgutil
+import re
 from pathlib import Path
-from typing import Dict, Any, Callable, Awaitable, List, Optional
+from typing import Dict, Any, Callable, Awaitable, Iterator, KeysView, List, Optional
 import os
+import random
+import threading
+import time
+import traceback
 from datetime import datetime
 
 from agents import Agent, Runner
+from being_agents.twitter_agent import run_tweet_pipeline
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
@@ -23,6 +28,9 @@ from rich import box
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Rich panels are only worth rendering on an interactive terminal
+_RICH_ON = console.is_terminal
+
 # Type hints for activity handlers
 ActivityHandler = Callable[[Dict, Any, Any], Awaitable[Dict[str, Any]]]
 ActivityRegistry = Dict[str, ActivityHandler]
@@ -30,8 +38,22 @@ ActivityRegistry = Dict[str, ActivityHandler]
 # Registry of activity handlers
 activity_registry: ActivityRegistry = {}
 
+# Registered activity names keyed by their lowercase form, for matching
+_lower_index: Dict[str, str] = {}
+
+# Alternation of all lowercase names for partial matching, rebuilt after registrations
+_fuzzy_pattern: Optional[re.Pattern] = None
+
+# Package roots already searched for handlers, guarded so discovery runs once per root
+_discovered_paths: set = set()
+_discovery_lock = threading.Lock()
+
 def display_activity_start(activity_name: str) -> None:
     """Display a stylized activity start banner."""
+    if not _RICH_ON:
+        logger.info(f"Executing activity: {activity_name}")
+        return
+    
     title = Text(f"⚡ Executing Activity: {activity_name} ⚡", style="bold cyan")
     panel = Panel(
         title,
@@ -47,6 +69,13 @@ def display_activity_result(result: Dict[str, Any], duration: float) -> None:
     message = result.get("message", "No message provided")
     error = result.get("error", None)
     
+    if not _RICH_ON:
+        if success:
+            logger.info(f"Activity completed in {duration:.2f}s: {message}")
+        else:
+            logger.info(f"Activity failed in {duration:.2f}s: {error or message}")
+        return
+    
     if success:
         title = Text("✅ Activity Completed", style="bold green")
         content = Text(message, style="green")
@@ -69,10 +98,18 @@ def display_activity_result(result: Dict[str, Any], duration: float) -> None:
 def register_activity(name: str):
     """Decorator to register an activity handler function."""
     def decorator(func: ActivityHandler) -> ActivityHandler:
+        global _fuzzy_pattern
         activity_registry[name] = func
+        _lower_index[name.lower()] = name
+        _fuzzy_pattern = None
         return func
     return decorator
 
+def lightweight(func: ActivityHandler) -> ActivityHandler:
+    """Decorator marking a trivial activity handler whose start and result banners are skipped."""
+    func._lightweight = True
+    return func
+
 def register_handler(name: str, handler: ActivityHandler) -> None:
     """
     Register an activity handler directly.
@@ -81,19 +118,23 @@ def register_handler(name: str, handler: ActivityHandler) -> None:
         name: The name of the activity to register
         handler: The handler function
     """
+    global _fuzzy_pattern
     activity_registry[name] = handler
+    _lower_index[name.lower()] = name
+    _fuzzy_pattern = None
     logger.debug(f"Registered activity handler: {name}")
 
-def get_registered_activities() -> List[str]:
-    """Get a list of all registered activity names."""
-    return list(activity_registry.keys())
+def get_registered_activities() -> KeysView[str]:
+    """Get a live view of all registered activity names."""
+    return activity_registry.keys()
 
 def discover_activity_handlers(package_name: str = ".") -> None:
     """
     Discover and register activity handlers from modules.
     
     This function walks through the package and looks for modules with 
-    activity handlers defined in them.
+    activity handlers defined in them. Each package is only searched once,
+    however many times this is called.
     
     Args:
         package_name: The name of the package to search (default: current package)
@@ -106,38 +147,64 @@ def discover_activity_handlers(package_name: str = ".") -> None:
             package = importlib.import_module(package_name)
             package_path = Path(package.__file__).parent
         
-        logger.info(f"Searching for activity handlers in: {package_path}")
-        
-        # Find all modules in the package recursively
-        for _, name, ispkg in pkgutil.walk_packages([str(package_path)], ""):
-            if ispkg:
-                continue
-                
-            # Skip __init__ files
-            if name.endswith("__init__"):
-                continue
-            
-            # Skip framework modules to avoid circular imports
-            if "framework" in name and not name.endswith("activity_handlers"):
-                continue
-                
-            try:
-                # Import the module
-                logger.debug(f"Checking module: {name}")
-                module = importlib.import_module(name)
-                
-                # Look for activity handlers
-                if hasattr(module, "ACTIVITY_HANDLERS"):
-                    for activity_name, handler in module.ACTIVITY_HANDLERS.items():
-                        register_handler(activity_name, handler)
-                        logger.info(f"Registered activity handler from {name}: {activity_name}")
-            except Exception as e:
-                logger.warning(f"Error loading activity handlers from {name}: {e}")
+        with _discovery_lock:
+            # Later calls for the same root have nothing new to register
+            if package_path in _discovered_paths:
+                logger.debug(f"Activity handlers already discovered in: {package_path}")
+                return
+            _register_handlers_under(package_path)
+            _discovered_paths.add(package_path)
     except Exception as e:
         logger.warning(f"Error discovering activity handlers: {e}")
-        import traceback
         logger.debug(traceback.format_exc())
 
+def _iter_package_modules(root: Path) -> Iterator[Path]:
+    """
+    Yield the module files under root, as walk_packages would find them.
+    
+    Only directories with an __init__.py are descended into, so virtualenvs,
+    .git and storage directories are never walked. __init__ files are skipped.
+    
+    Args:
+        root: Directory to search; it need not be a package itself
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Prune in place so os.walk skips anything that isn't a package
+        dirnames[:] = sorted(d for d in dirnames if os.path.isfile(os.path.join(dirpath, d, "__init__.py")))
+        for filename in sorted(filenames):
+            if filename.endswith(".py") and filename != "__init__.py":
+                yield Path(dirpath) / filename
+
+def _register_handlers_under(package_path: Path) -> None:
+    """Import the modules under package_path that define ACTIVITY_HANDLERS and register them."""
+    logger.info(f"Searching for activity handlers in: {package_path}")
+    
+    # Find all modules in the package recursively, only importing files that
+    # mention ACTIVITY_HANDLERS
+    for path in _iter_package_modules(package_path):
+        relative = path.relative_to(package_path).with_suffix("")
+        name = ".".join(relative.parts)
+        
+        # Skip framework modules to avoid circular imports
+        if "framework" in name and not name.endswith("activity_handlers"):
+            continue
+        
+        try:
+            if b"ACTIVITY_HANDLERS" not in path.read_bytes():
+                continue
+            
+            # Import the module
+            logger.debug(f"Checking module: {name}")
+            module = importlib.import_module(name)
+            
+            # Look for activity handlers
+            if hasattr(module, "ACTIVITY_HANDLERS"):
+                for activity_name, handler in module.ACTIVITY_HANDLERS.items():
+                    register_handler(activity_name, handler)
+                    logger.info(f"Registered activity handler from {name}: {activity_name}")
+        except Exception as e:
+            logger.warning(f"Error loading activity handlers from {name}: {e}")
+
 async def execute_activity(activity_name: str, agent_creators: Dict, context: Any, **kwargs) -> Dict[str, Any]:
     """
     Execute an activity by name using the registry.
@@ -151,33 +218,46 @@ async def execute_activity(activity_name: str, agent_creators: Dict, context: An
     Returns:
         Dictionary with the result of the activity
     """
+    global _fuzzy_pattern
+    
     # Normalize activity name for matching
     activity_name = activity_name.lower().strip()
     
-    start_time = datetime.now()
-    handler = None
+    start = time.monotonic()
     
-    # First try exact match
-    if activity_name in activity_registry:
-        handler = activity_registry[activity_name]
-        display_activity_start(activity_name)
-    else:
-        # If no exact match, try partial match
-        for name, h in activity_registry.items():
-            if name.lower() in activity_name:
-                handler = h
-                activity_name = name
-                display_activity_start(name)
-                break
+    # Bind the registry locally and try the exact name with a single lookup
+    registry = activity_registry
+    handler = registry.get(activity_name)
+    
+    if handler is None:
+        # Fall back to the lowercase index, then to a partial match against the
+        # lowercase names, preferring the longest name at the earliest position
+        name = _lower_index.get(activity_name)
+        if name is None and _lower_index:
+            if _fuzzy_pattern is None:
+                _fuzzy_pattern = re.compile("|".join(
+                    re.escape(lower_name) for lower_name in sorted(_lower_index, key=len, reverse=True)
+                ))
+            match = _fuzzy_pattern.search(activity_name)
+            if match:
+                name = _lower_index[match.group(0)]
+        if name is not None:
+            handler = registry[name]
+            activity_name = name
     
     if handler:
+        # Lightweight handlers do too little to be worth rendering banners for
+        show_display = not getattr(handler, "_lightweight", False)
+        if show_display:
+            display_activity_start(activity_name)
         try:
             result = await handler(agent_creators, context, **kwargs)
-            duration = (datetime.now() - start_time).total_seconds()
-            display_activity_result(result, duration)
+            if show_display:
+                duration = time.monotonic() - start
+                display_activity_result(result, duration)
             return result
         except Exception as e:
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.monotonic() - start
             error_result = {"success": False, "error": str(e)}
             display_activity_result(error_result, duration)
             return error_result
@@ -190,66 +270,14 @@ async def execute_activity(activity_name: str, agent_creators: Dict, context: An
 async def handle_tweet_posting(agent_creators: Dict, context: Any, **kwargs) -> Dict[str, Any]:
     """Handle posting a tweet with optional image."""
     try:
-        # Create twitter agent
-        twitter_agent = agent_creators['create_twitter_agent'](context.character_config)
-        
-        # Generate tweet content using the agent
-        tweet_prompt = "Generate an engaging tweet that reflects the digital being's personality."
-        tweet_result = await Runner.run(twitter_agent, tweet_prompt, context=context)
-        tweet_text = tweet_result.final_output
-        
-        # Trim tweet if needed
-        if len(tweet_text) > 280:
-            tweet_text = tweet_text[:277] + "..."
-            
-        logger.info(f"Generated tweet: {tweet_text}")
-        
-        # Get the X API skill for posting
-        from skills.x_api import XAPISkill
-        from skills.image_gen import ImageGenSkill
-        
-        # Initialize skills
-        x_api = XAPISkill(context.character_config)
-        image_gen = ImageGenSkill(context.character_config)
-        
-        # Generate an image for the tweet
-        image_prompt = f"Create an artistic image that represents this tweet: {tweet_text}"
-        image_result = await image_gen.generate_image(
-            prompt=image_prompt,
-            size=(1024, 1024),
-            character_config=context.character_config
-        )
-        
-        # Prepare media URLs
-        media_urls = []
-        if image_result.get("success"):
-            image_url = image_result.get("image_data", {}).get("url")
-            if image_url:
-                media_urls.append(image_url)
-                logger.info(f"Generated image for tweet: {image_url}")
-        
-        # Post the tweet with media
-        post_result = await x_api.post_tweet(tweet_text, media_urls)
-        
-        # Store tweet in context
-        tweet_data = {
-            "timestamp": datetime.now().isoformat(),
-            "text": tweet_text,
-            "media_urls": media_urls,
-            "success": post_result.get("success", False)
-        }
-        
-        if post_result.get("tweet_id"):
-            tweet_data["id"] = post_result["tweet_id"]
-        if post_result.get("tweet_link"):
-            tweet_data["link"] = post_result["tweet_link"]
-            
-        # Add to context
-        context.add_tweet(tweet_data)
+        # Generate, illustrate and post the tweet in one fixed pipeline
+        post_result = await run_tweet_pipeline(context)
+        tweet_text = post_result["text"]
+        media_urls = post_result["media_urls"]
         
         if post_result.get("success"):
             logger.info(f"Tweet posted successfully: {tweet_text}")
-            return {"success": True, "message": f"Tweet posted successfully with {len(media_urls)} images"}
+            return {"success": True, "message": f"Tweet posted successfully with {len(media_urls)} images", "content": tweet_text}
         else:
             error = post_result.get("error", "Unknown error")
             logger.error(f"Error posting tweet: {error}")
@@ -278,7 +306,7 @@ async def handle_daily_thought(agent_creators: Dict, context: Any, **kwargs) ->
             thought = thought_result.get("thought", "")
             topic = thought_result.get("topic", "")
             logger.info(f"Generated thought on '{topic}': {thought[:50]}...")
-            return {"success": True, "message": f"Generated philosophical thought on {topic}"}
+            return {"success": True, "message": f"Generated philosophical thought on {topic}", "content": thought}
         else:
             error = thought_result.get("error", "Unknown error")
             logger.warning(f"Failed to generate thought: {error}")
@@ -289,6 +317,7 @@ async def handle_daily_thought(agent_creators: Dict, context: Any, **kwargs) ->
         return {"success": False, "error": str(e)}
 
 @register_activity("nap")
+@lightweight
 async def handle_nap(agent_creators: Dict, context: Any, **kwargs) -> Dict[str, Any]:
     """Handle taking a nap (resting)."""
     logger.info("Digital Being is taking a nap (resting)")
@@ -317,7 +346,7 @@ async def handle_meditation(agent_creators: Dict, context: Any, **kwargs) -> Dic
             # Also restore some energy
             context.energy = min(1.0, context.energy + 0.2)
             
-            return {"success": True, "message": f"Meditation complete. Energy now: {context.energy:.2f}"}
+            return {"success": True, "message": f"Meditation complete. Energy now: {context.energy:.2f}", "content": thought}
         else:
             return {"success": False, "error": reflection_result.get("error", "Unknown error")}
     except Exception as e:
@@ -332,7 +361,6 @@ async def handle_research(agent_creators: Dict, context: Any, **kwargs) -> Dict[
         preferences = context.character_config.get("preferences", {})
         interests = preferences.get("topics_of_interest", ["technology", "philosophy", "art"])
         
-        import random
         topic = random.choice(interests)
         
         # Use our tools registry to directly generate a reflection
@@ -348,7 +376,7 @@ async def handle_research(agent_creators: Dict, context: Any, **kwargs) -> Dict[
         if research_result.get("success"):
             thought = research_result.get("thought", "")
             logger.info(f"Research completed on {topic}: {thought[:50]}...")
-            return {"success": True, "message": f"Research on {topic} completed successfully"}
+            return {"success": True, "message": f"Research on {topic} completed successfully", "content": thought}
         else:
             return {"success": False, "error": research_result.get("error", "Unknown error")}
     except Exception as e:
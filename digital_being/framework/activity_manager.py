@@ -8,7 +8,12 @@ to execute the selected activities.
 
 import logging
 import asyncio
+import bisect
+import functools
+import itertools
 import random
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
 
@@ -20,6 +25,16 @@ logger = logging.getLogger(__name__)
 # Type hint for activity handlers
 ActivityHandler = Callable[[Dict, Any, Any], Awaitable[Dict[str, Any]]]
 
+@dataclass(slots=True)
+class ActivityStatus:
+    """Status of one configured activity, as reported by get_activity_status."""
+    enabled: bool
+    last_executed: Optional[str]
+    seconds_since_last: Optional[float]
+    cooldown_remaining: float
+    enough_energy: bool
+    available: bool
+
 class ActivityManager:
     """
     Manages activities for the Digital Being based on character configuration.
@@ -34,7 +49,9 @@ class ActivityManager:
             context: The BeingContext object containing character configuration
         """
         self.context = context
-        self.activity_history: Dict[str, datetime] = {}
+        # Monotonic time each activity was last executed
+        self.activity_history: Dict[str, float] = {}
+        # Live view of the registry, so stub handlers registered later show up in it
         self.available_activities = get_registered_activities()
         
         # Initialize cooldowns from character config
@@ -62,6 +79,47 @@ class ActivityManager:
         extra_handlers = registered_activities - configured_activities
         if extra_handlers:
             logger.info(f"Activity handlers without config: {extra_handlers}")
+        
+        self._compile_activities()
+    
+    def _compile_activities(self) -> None:
+        """Precompute the config values checked for every activity on each availability check."""
+        self._compiled_activities: List[Tuple[str, float, float, frozenset]] = []
+        for activity_name in self.available_activities:
+            config = self.activities_config.get(activity_name)
+            
+            # Skip if not in config or disabled
+            if config is None or not config.get("enabled", True):
+                continue
+            
+            self._compiled_activities.append((
+                activity_name,
+                config.get("cooldown", 0),
+                config.get("min_energy", 0.0),
+                frozenset(config.get("required_skills", []))
+            ))
+        
+        # Every configured activity's status fields, in config order
+        self._status_activities: List[Tuple[str, bool, float, float]] = [
+            (
+                activity_name,
+                config.get("enabled", True),
+                config.get("cooldown", 0),
+                config.get("min_energy", 0.0)
+            )
+            for activity_name, config in self.activities_config.items()
+        ]
+        
+        # The personality is fixed, so each activity's personality weight is too
+        personality = self.context.get_personality()
+        self._personality_weights: Dict[str, float] = {
+            activity_name: 1.0 + sum(
+                personality[trait] * trait_weight
+                for trait, trait_weight in config.get("weights", {}).items()
+                if trait in personality
+            )
+            for activity_name, config in self.activities_config.items()
+        }
     
     async def _stub_activity_handler(self, agent_creators: Dict, context: Any, **kwargs) -> Dict[str, Any]:
         """
@@ -118,25 +176,19 @@ class ActivityManager:
             missing_activities: Set of activity names without handlers
         """
         for activity_name in missing_activities:
-            # Create a closure to capture the activity name
-            def create_handler(name):
-                async def handler(agent_creators, context, **kwargs):
-                    return await self._stub_activity_handler(
-                        agent_creators, 
-                        context, 
-                        activity_name=name, 
-                        **kwargs
-                    )
-                return handler
-            
-            # Register the handler with the captured name
-            register_handler(activity_name, create_handler(activity_name))
+            # Register the stub handler with the activity name bound
+            register_handler(
+                activity_name,
+                functools.partial(self._stub_activity_handler, activity_name=activity_name)
+            )
             logger.info(f"Created stub handler for activity: {activity_name}")
-        
-        # Update available activities list
-        self.available_activities = get_registered_activities()
     
-    def get_available_activities(self) -> List[str]:
+    def get_last_activity(self) -> Optional[str]:
+        """Get the name of the most recently executed activity, or None if none has run yet."""
+        history = self.activity_history
+        return max(history, key=history.get) if history else None
+    
+    def get_available_activities(self, now: Optional[float] = None) -> List[str]:
         """
         Get the list of activities that are:
         1. Configured in character.json
@@ -145,80 +197,68 @@ class ActivityManager:
         4. Have their cooldown period elapsed
         5. Have sufficient energy available
         
+        Args:
+            now: Current monotonic time, if the caller already has it
+        
         Returns:
             List of activity names that are available
         """
-        now = datetime.now()
+        if now is None:
+            now = time.monotonic()
         available = []
         
-        for activity_name in self.available_activities:
-            # Skip if not in config
-            if activity_name not in self.activities_config:
-                continue
-                
-            config = self.activities_config[activity_name]
-            
-            # Skip if disabled
-            if not config.get("enabled", True):
-                continue
-                
+        # Snapshot which skills are enabled
+        enabled_skills = {
+            skill for skill, skill_config in self.context.skills_config.items()
+            if isinstance(skill_config, dict) and skill_config.get("enabled", False)
+        }
+        
+        # Only configured, enabled activities with handlers are compiled
+        for activity_name, cooldown_seconds, min_energy, required_skills in self._compiled_activities:
             # Check cooldown
             last_executed = self.activity_history.get(activity_name)
-            cooldown_seconds = config.get("cooldown", 0)
-            if last_executed and (now - last_executed).total_seconds() < cooldown_seconds:
+            if last_executed is not None and now - last_executed < cooldown_seconds:
                 continue
                 
             # Check energy
-            min_energy = config.get("min_energy", 0.0)
             if self.context.energy < min_energy:
                 continue
                 
             # Check required skills
-            required_skills = config.get("required_skills", [])
-            skills_config = self.context.skills_config
-            
-            if all(
-                skills_config.get(skill, {}).get("enabled", False)
-                for skill in required_skills
-            ):
+            if required_skills <= enabled_skills:
                 available.append(activity_name)
         
         return available
     
-    def calculate_activity_weights(self, activities: List[str]) -> Dict[str, float]:
+    def calculate_activity_weights(self, activities: List[str], now: Optional[float] = None) -> Dict[str, float]:
         """
         Calculate weights for activity selection based on personality traits.
         
         Args:
             activities: List of activity names to calculate weights for
+            now: Current monotonic time, if the caller already has it
             
         Returns:
             Dictionary mapping activity names to selection weights
         """
+        if now is None:
+            now = time.monotonic()
         weights = {}
-        personality = self.context.get_personality()
+        personality_weighting = self.activity_selection_config.get("personality_weighting", True)
         
         # Base weight starts at 1.0
         for activity in activities:
-            config = self.activities_config.get(activity, {})
-            activity_weights = config.get("weights", {})
-            
-            # Start with base weight
-            weight = 1.0
-            
-            # Add personality trait weights
-            if self.activity_selection_config.get("personality_weighting", True):
-                for trait, trait_weight in activity_weights.items():
-                    if trait in personality:
-                        # Multiply by the personality trait value × the weight for this activity
-                        trait_value = personality.get(trait, 0.5)
-                        weight += trait_value * trait_weight
+            # Start with base weight, plus the precomputed personality trait weights
+            if personality_weighting:
+                weight = self._personality_weights.get(activity, 1.0)
+            else:
+                weight = 1.0
             
             # Consider time since last execution (favor activities not done recently)
             if self.activity_selection_config.get("time_sensitivity", True):
                 last_executed = self.activity_history.get(activity)
-                if last_executed:
-                    hours_since = (datetime.now() - last_executed).total_seconds() / 3600
+                if last_executed is not None:
+                    hours_since = (now - last_executed) / 3600
                     # Gradually increase weight over time (max 2x boost)
                     time_factor = min(2.0, 1.0 + (hours_since / 24))
                     weight *= time_factor
@@ -237,8 +277,9 @@ class ActivityManager:
         Returns:
             The selected activity name
         """
-        # Get available activities
-        available = self.get_available_activities()
+        # Get available activities, using one timestamp for the whole selection
+        now = time.monotonic()
+        available = self.get_available_activities(now)
         
         if not available:
             # Default to nap if nothing else is available
@@ -259,21 +300,29 @@ class ActivityManager:
                     return activity
         
         # Otherwise select based on weights
-        weights = self.calculate_activity_weights(available)
-        
-        # Normalize weights to probabilities
-        total_weight = sum(weights.values())
-        probabilities = {k: v/total_weight for k, v in weights.items()}
-        
-        # Select activity using weighted random choice
-        activities = list(probabilities.keys())
-        probs = [probabilities[a] for a in activities]
-        
-        selected = random.choices(activities, weights=probs, k=1)[0]
+        selected = self.choose_weighted(available, now)
         logger.info(f"Selected activity: {selected} (from {len(available)} available)")
         
         return selected
     
+    def choose_weighted(self, activities: List[str], now: Optional[float] = None) -> str:
+        """
+        Pick one of the activities at random, weighted by personality and time since last run.
+        
+        Args:
+            activities: Non-empty list of activity names to choose from
+            now: Current monotonic time, if the caller already has it
+            
+        Returns:
+            The chosen activity name
+        """
+        weights = self.calculate_activity_weights(activities, now)
+        
+        # Weighted random choice over cumulative weights; hi keeps float rounding
+        # from landing past the last activity, as in random.choices
+        cumulative = list(itertools.accumulate(weights[a] for a in activities))
+        return activities[bisect.bisect(cumulative, random.random() * cumulative[-1], 0, len(activities) - 1)]
+    
     async def execute_activity(self, activity_name: str, agent_creators: Dict, **kwargs) -> Dict[str, Any]:
         """
         Execute an activity and handle energy cost and cooldown tracking.
@@ -287,8 +336,8 @@ class ActivityManager:
             Dictionary with the result of the activity execution
         """
         # Record activity start time
-        start_time = datetime.now()
-        self.activity_history[activity_name] = start_time
+        start = time.monotonic()
+        self.activity_history[activity_name] = start
         
         # Get activity configuration
         config = self.activities_config.get(activity_name, {})
@@ -312,45 +361,47 @@ class ActivityManager:
             logger.info(f"Nap restored energy to {self.context.energy:.2f}")
         
         # Log activity execution time
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = time.monotonic() - start
         logger.info(f"Activity {activity_name} executed in {duration:.2f}s, energy now: {self.context.energy:.2f}")
         
         return result
         
-    def get_activity_status(self) -> Dict[str, Any]:
+    def get_activity_status(self) -> Dict[str, ActivityStatus]:
         """
         Get the current status of all activities.
         
         Returns:
-            Dictionary with activity status information
+            Dictionary mapping activity names to their ActivityStatus
+            (use dataclasses.asdict to serialize one)
         """
-        now = datetime.now()
+        now = time.monotonic()
+        # Wall-clock time matching now, for reporting when activities last ran
+        wall_now = datetime.now()
+        energy = self.context.energy
+        history = self.activity_history
         status = {}
         
-        for activity_name, config in self.activities_config.items():
-            last_executed = self.activity_history.get(activity_name)
-            cooldown_seconds = config.get("cooldown", 0)
+        for activity_name, enabled, cooldown_seconds, min_energy in self._status_activities:
+            last_executed = history.get(activity_name)
             
-            if last_executed:
-                seconds_since = (now - last_executed).total_seconds()
+            if last_executed is not None:
+                seconds_since = now - last_executed
                 cooldown_remaining = max(0, cooldown_seconds - seconds_since)
+                last_executed_iso = (wall_now - timedelta(seconds=seconds_since)).isoformat()
             else:
                 seconds_since = None
                 cooldown_remaining = 0
+                last_executed_iso = None
                 
-            enough_energy = self.context.energy >= config.get("min_energy", 0.0)
+            enough_energy = energy >= min_energy
             
-            status[activity_name] = {
-                "enabled": config.get("enabled", True),
-                "last_executed": last_executed.isoformat() if last_executed else None,
-                "seconds_since_last": seconds_since,
-                "cooldown_remaining": cooldown_remaining,
-                "enough_energy": enough_energy,
-                "available": (
-                    config.get("enabled", True) and 
-                    (not last_executed or seconds_since >= cooldown_seconds) and
-                    enough_energy
-                )
-            }
+            status[activity_name] = ActivityStatus(
+                enabled=enabled,
+                last_executed=last_executed_iso,
+                seconds_since_last=seconds_since,
+                cooldown_remaining=cooldown_remaining,
+                enough_energy=enough_energy,
+                available=enabled and cooldown_remaining == 0 and enough_energy
+            )
             
-        return status 
\ No newline at end of file
+        return status
@@ -0,0 +1,45 @@
+"""
+Composio Client
+
+Shared Composio toolset used by the connection and integration modules.
+"""
+
+import os
+import logging
+import threading
+from typing import Optional, Any
+
+try:
+    from composio_openai import ComposioToolSet
+except ImportError:
+    logging.warning("composio_openai not installed. Some features will be unavailable.")
+
+logger = logging.getLogger(__name__)
+
+# Singleton toolset, so all Composio calls share one HTTP client
+_toolset = None
+_toolset_lock = threading.Lock()
+
+def get_toolset() -> Optional[Any]:
+    """Get or initialize the shared Composio toolset."""
+    global _toolset
+    
+    if _toolset is not None:
+        return _toolset
+    
+    with _toolset_lock:
+        # Another thread may have created it while we waited
+        if _toolset is not None:
+            return _toolset
+        
+        api_key = os.getenv("COMPOSIO_API_KEY")
+        if not api_key:
+            logger.warning("COMPOSIO_API_KEY not set in environment variables")
+            return None
+        
+        try:
+            _toolset = ComposioToolSet(api_key=api_key)
+            return _toolset
+        except Exception as e:
+            logger.error(f"Error initializing Composio toolset: {e}")
+            return None
@@ -16,10 +16,7 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Confirm
 
-try:
-    from composio_openai import ComposioToolSet
-except ImportError:
-    logging.warning("composio_openai not installed. Some features will be unavailable.")
+from framework.composio_client import get_toolset
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -27,20 +24,36 @@ console = Console()
 # Default OAuth file path
 DEFAULT_OAUTH_FILE = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) / "storage" / "composio_oauth.json"
 
-# Connection cache
+# How long to wait for a new connection to appear in the OAuth file
+CONNECTION_WAIT_SECONDS = 5.0
+
+# Connection cache, keyed by the OAuth file path and mtime it was parsed from
 _connections = {}
-_toolset = None
+_connections_key = None
+_loaded = False
 
 def _load_connections(oauth_file: Path = DEFAULT_OAUTH_FILE) -> Dict[str, Any]:
-    """Load connection data from OAuth file."""
-    global _connections
+    """Load connection data from OAuth file, reusing the parsed data while the file is unchanged."""
+    global _connections, _connections_key, _loaded
+    
+    _loaded = True
+    try:
+        st = oauth_file.stat()
+    except OSError:
+        return {}
     
-    if not oauth_file.exists():
+    # An empty file is still being written by `composio add`, so there is nothing to parse yet
+    if st.st_size == 0:
         return {}
     
+    key = (oauth_file, st.st_mtime_ns)
+    if key == _connections_key:
+        return _connections
+    
     try:
         with open(oauth_file, 'r') as f:
             _connections = json.load(f)
+        _connections_key = key
         return _connections
     except Exception as e:
         logger.warning(f"Error loading OAuth file: {e}")
@@ -48,22 +61,7 @@ def _load_connections(oauth_file: Path = DEFAULT_OAUTH_FILE) -> Dict[str, Any]:
 
 def _get_toolset() -> Optional[Any]:
     """Get or initialize the Composio toolset."""
-    global _toolset
-    
-    if _toolset is not None:
-        return _toolset
-    
-    api_key = os.getenv("COMPOSIO_API_KEY")
-    if not api_key:
-        logger.warning("COMPOSIO_API_KEY not set in environment variables")
-        return None
-    
-    try:
-        _toolset = ComposioToolSet(api_key=api_key)
-        return _toolset
-    except Exception as e:
-        logger.error(f"Error initializing Composio toolset: {e}")
-        return None
+    return get_toolset()
 
 def is_connected(app_name: str) -> bool:
     """
@@ -75,10 +73,8 @@ def is_connected(app_name: str) -> bool:
     Returns:
         True if connected, False otherwise
     """
-    global _connections
-    
-    # Load connections if not loaded yet
-    if not _connections:
+    # Load connections if not loaded yet (an empty file counts as loaded)
+    if not _loaded:
         _load_connections()
     
     # Check in local cache
@@ -118,11 +114,14 @@ def ensure_connection(app_name: str, interactive: bool = True) -> bool:
         process = subprocess.Popen(['composio', 'add', app_name.lower()])
         process.wait()
         
-        # Wait for connection to register
-        time.sleep(2)
-        
-        # Check if successful by loading connections again
-        _load_connections()
+        # Wait for the connection to register, reloading as soon as the
+        # OAuth file changes rather than sleeping a fixed time
+        deadline = time.monotonic() + CONNECTION_WAIT_SECONDS
+        while True:
+            _load_connections()
+            if is_connected(app_name) or time.monotonic() >= deadline:
+                break
+            time.sleep(0.1)
         
         if is_connected(app_name):
             console.print(f"Successfully connected to {app_name}!", style="green")
@@ -134,6 +133,3 @@ def ensure_connection(app_name: str, interactive: bool = True) -> bool:
     except Exception as e:
         logger.error(f"Error connecting to {app_name}: {e}")
         return False
-
-# Load connections at import time
-_load_connections()
\ No newline at end of file
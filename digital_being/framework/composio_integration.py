@@ -5,6 +5,7 @@ Simple interface to execute Composio actions.
 """
 import logging
 import os
+import threading
 import json
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -14,36 +15,44 @@ try:
 except ImportError as e:
     raise ImportError(f"Failed to import Composio: {e}. Please install with 'pip install composio-openai'")
 
+from framework.composio_client import get_toolset
+
 logger = logging.getLogger(__name__)
 
 # Singleton variables
-_toolset = None
 _initialized = False
+_init_lock = threading.Lock()
 _entity_id = "MyDigitalBeing"
 _oauth_file_path = Path(os.path.dirname(os.path.dirname(__file__))) / "storage" / "composio_oauth.json"
 
 def initialize() -> bool:
-    """Initialize the Composio toolset."""
-    global _toolset, _initialized
+    """Initialize the Composio toolset (safe to call concurrently)."""
+    global _initialized
     
-    try:
-        # Get API key from environment
-        api_key = os.getenv("COMPOSIO_API_KEY")
+    with _init_lock:
+        if _initialized:
+            return True
         
-        if not api_key:
-            logger.error("COMPOSIO_API_KEY environment variable not set. Please set this in your .env file.")
+        try:
+            # Get API key from environment
+            api_key = os.getenv("COMPOSIO_API_KEY")
+            
+            if not api_key:
+                logger.error("COMPOSIO_API_KEY environment variable not set. Please set this in your .env file.")
+                return False
+            
+            # Share the toolset with the connection helpers
+            if get_toolset() is None:
+                _initialized = False
+                return False
+            _initialized = True
+            logger.info("Composio integration initialized successfully")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to initialize Composio: {e}")
+            _initialized = False
             return False
-        
-        # Create toolset
-        _toolset = ComposioToolSet(api_key=api_key)
-        _initialized = True
-        logger.info("Composio integration initialized successfully")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to initialize Composio: {e}")
-        _initialized = False
-        return False
 
 def execute_action(action: str, params: Dict[str, Any], entity_id: str = _entity_id) -> Dict[str, Any]:
     """
@@ -57,23 +66,22 @@ def execute_action(action: str, params: Dict[str, Any], entity_id: str = _entity
     Returns:
         Response from Composio
     """
-    global _toolset, _initialized
-    
-    if not _initialized or not _toolset:
+    if not _initialized:
         if not initialize():
             return {"success": False, "error": "Composio not initialized. Check COMPOSIO_API_KEY environment variable."}
     
     try:
         # Log action
         if action == "TWITTER_CREATION_OF_A_POST":
-            logger.info(f"Posting tweet via Composio: {params.get('text', '')[:30]}...")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Posting tweet via Composio: {params.get('text', '')[:30]}...")
         elif action == "TWITTER_MEDIA_UPLOAD_MEDIA":
             logger.info(f"Uploading media to Twitter via Composio")
         else:
             logger.info(f"Executing Composio action: {action}")
         
         # Execute the action
-        response = _toolset.execute_action(
+        response = get_toolset().execute_action(
             action=action,
             params=params,
             entity_id=entity_id
@@ -89,17 +97,14 @@ def execute_action(action: str, params: Dict[str, Any], entity_id: str = _entity
 class ComposioManager:
     """Manager for Composio integration (for backward compatibility)."""
     
-    def __init__(self):
-        """Initialize the manager."""
-        self.initialized = _initialized
-    
-    def initialize(self) -> bool:
-        """Initialize the Composio toolset."""
-        return initialize()
+    # Bound straight to the module-level functions, so calls skip a wrapper method
+    initialize = staticmethod(initialize)
+    execute_action = staticmethod(execute_action)
     
-    def execute_action(self, action: str, params: Dict[str, Any], entity_id: str) -> Dict[str, Any]:
-        """Execute a Composio action."""
-        return execute_action(action, params, entity_id)
+    @property
+    def initialized(self) -> bool:
+        """Whether the Composio toolset has been initialized."""
+        return _initialized
 
 # Create the singleton for backward compatibility
 composio_manager = ComposioManager()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+OpenAI Client
+
+Shared async OpenAI client and request rate limiter used by the agents,
+tools and skills.
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+# Shared OpenAI client, created on first use so the API key from .env is available.
+# Reusing one client keeps its HTTP connection pool alive across agent runs.
+_openai_client: Optional[AsyncOpenAI] = None
+
+def get_client() -> AsyncOpenAI:
+    """Get or initialize the shared async OpenAI client."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            max_retries=4,
+            timeout=60.0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            )
+        )
+    return _openai_client
+
+async def close_client() -> None:
+    """Close the shared async OpenAI client and its connection pool."""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+class RateLimiter:
+    """
+    Async limiter allowing at most max_rate requests in any time_period seconds.
+    
+    Args:
+        max_rate: Maximum number of requests per period
+        time_period: Length of the period in seconds
+    """
+    
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._timestamps: deque = deque()
+        self._lock = asyncio.Lock()
+    
+    async def __aenter__(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                # Forget requests that have left the window
+                while self._timestamps and now - self._timestamps[0] >= self.time_period:
+                    self._timestamps.popleft()
+                if len(self._timestamps) < self.max_rate:
+                    break
+                await asyncio.sleep(self.time_period - (now - self._timestamps[0]))
+            self._timestamps.append(now)
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+# Shared limit on Responses API requests across all agents
+rate_limiter = RateLimiter(max_rate=500, time_period=60.0)
@@ -5,32 +5,192 @@ This module contains data models and schema definitions for the Digital Being fr
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from collections import defaultdict, deque
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Deque, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of memories and tweets kept in memory
+MAX_MEMORIES = 100
+MAX_TWEETS = 50
+# Number of recent memories quoted in prompts
+RECENT_TAILS = 3
+
+@dataclass(frozen=True, slots=True)
+class Personality:
+    """Personality traits used by the agents, each between 0 and 1."""
+    curiosity: float = 0.5
+    creativity: float = 0.5
+    analytical: float = 0.5
+    friendliness: float = 0.5
+    quirkiness: float = 0.5
+    thoughtfulness: float = 0.5
+
+@dataclass(frozen=True, slots=True)
+class Preferences:
+    """Content preferences from the character config."""
+    writing_style: str = "thoughtful"
+    topics_of_interest: Tuple[str, ...] = ()
+    topics_str: str = "general topics"
+    top_interests_str: str = "general topics"
+    art_style: str = "digital art"
+
+@dataclass(frozen=True, slots=True)
+class Appearance:
+    """Visual appearance from the character config."""
+    color_scheme: Optional[str] = None
+
+@dataclass(frozen=True, slots=True)
+class Character:
+    """Typed view of the character config, parsed once per context."""
+    name: str = "Digital Being"
+    personality: Personality = Personality()
+    preferences: Preferences = Preferences()
+    appearance: Appearance = Appearance()
+    personality_summary: str = "balanced personality"
+    
+    @classmethod
+    def from_config(cls, character_config: Dict[str, Any]) -> "Character":
+        """Build a Character from a character.json style dictionary."""
+        personality = character_config.get("personality", {})
+        preferences = character_config.get("preferences", {})
+        appearance = character_config.get("appearance", {})
+        topics = tuple(preferences.get("topics_of_interest", ()))
+        
+        # Describe the notably high and low traits once, for the prompts that mention them
+        notable_traits = [
+            f"high {trait}" if value > 0.7 else f"low {trait}"
+            for trait, value in personality.items() if value > 0.7 or value < 0.3
+        ]
+        return cls(
+            name=character_config.get("name", "Digital Being"),
+            personality=Personality(**{
+                trait: personality[trait]
+                for trait in Personality.__slots__ if trait in personality
+            }),
+            preferences=Preferences(
+                writing_style=preferences.get("writing_style", "thoughtful"),
+                topics_of_interest=topics,
+                topics_str=", ".join(topics) if topics else "general topics",
+                top_interests_str=", ".join(topics[:3]) if topics else "general topics",
+                art_style=preferences.get("art_style", "digital art")
+            ),
+            appearance=Appearance(color_scheme=appearance.get("color_scheme")),
+            personality_summary=", ".join(notable_traits) if notable_traits else "balanced personality"
+        )
+
 @dataclass
 class BeingContext:
     """Context object for the Digital Being."""
     character_config: Dict[str, Any] = field(default_factory=dict)
     skills_config: Dict[str, Any] = field(default_factory=dict)
-    memories: List[Dict[str, Any]] = field(default_factory=list)
-    tweets: List[Dict[str, Any]] = field(default_factory=list)
+    memories: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=MAX_MEMORIES))
+    tweets: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=MAX_TWEETS))
     energy: float = 1.0
+    latest_by_category: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    _memories_by_category: Dict[str, Deque[Dict[str, Any]]] = field(
+        default_factory=lambda: defaultdict(deque), init=False, repr=False
+    )
+    # Leading text of the last few memories, for prompt context
+    recent_content_tails: Deque[str] = field(
+        default_factory=lambda: deque(maxlen=RECENT_TAILS), init=False, repr=False
+    )
+    archive_dir: Optional[Path] = None
+    character: Character = field(init=False)
+    # Evicted entries waiting to be appended to the archive, keyed by kind
+    _archive_pending: Dict[str, List[bytes]] = field(default_factory=dict, init=False, repr=False)
+    
+    def __post_init__(self):
+        self.character = Character.from_config(self.character_config)
+        if self.archive_dir is not None:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+    
+    @property
+    def x_api(self):
+        """X API skill, shared with the twitter tools so posts count against one limit."""
+        from tools.twitter_tools import get_x_api_skill
+        return get_x_api_skill(self)
+    
+    @property
+    def image_gen(self):
+        """Image generation skill, shared with the twitter tools."""
+        from tools.twitter_tools import get_image_gen_skill
+        return get_image_gen_skill(self)
+    
+    def _archive(self, kind: str, item: Dict[str, Any]) -> None:
+        """Queue an evicted entry for the JSONL archive of its kind, if archiving is enabled."""
+        if self.archive_dir is None:
+            return
+        self._archive_pending.setdefault(kind, []).append(orjson.dumps(item, default=str) + b"\n")
+    
+    def take_archive_batch(self) -> Dict[str, List[bytes]]:
+        """
+        Hand over the evicted entries queued since the last call.
+        
+        Returns:
+            Dict[str, List[bytes]]: JSONL lines keyed by archive kind
+        """
+        pending, self._archive_pending = self._archive_pending, {}
+        return pending
+    
+    def write_archive_batch(self, batch: Dict[str, List[bytes]]) -> None:
+        """
+        Append a batch from take_archive_batch to the archive files.
+        
+        This does blocking file I/O, so run it off the event loop.
+        
+        Args:
+            batch: JSONL lines keyed by archive kind
+        """
+        for kind, lines in batch.items():
+            try:
+                with open(self.archive_dir / f"{kind}.jsonl", "ab") as f:
+                    f.writelines(lines)
+            except Exception as e:
+                logger.warning(f"Error archiving {kind}: {e}")
     
     def add_memory(self, memory: Dict[str, Any]) -> None:
-        """Add a memory and trim if too many."""
+        """Add a memory, archiving the oldest one if the limit is reached."""
+        if len(self.memories) == self.memories.maxlen:
+            evicted = self.memories[0]
+            self._archive("memories", evicted)
+            # The oldest memory overall is also the oldest in its category
+            self._memories_by_category[evicted.get("category", "general")].popleft()
+        
+        # Uncategorized memories count as "general" in both indexes
+        category = memory.get("category", "general")
         self.memories.append(memory)
-        if len(self.memories) > 100:
-            self.memories = self.memories[-100:]
+        self._memories_by_category[category].append(memory)
+        self.recent_content_tails.append(memory.get("content", "")[:50])
+        self.latest_by_category[category] = memory
     
     def add_tweet(self, tweet: Dict[str, Any]) -> None:
-        """Add a tweet and trim if too many."""
+        """Add a tweet, archiving the oldest one if the limit is reached."""
+        if len(self.tweets) == self.tweets.maxlen:
+            self._archive("tweets", self.tweets[0])
         self.tweets.append(tweet)
-        if len(self.tweets) > 50:
-            self.tweets = self.tweets[-50:]
+    
+    def dump_state(self) -> bytes:
+        """Serialize the state that should survive a restart (energy, memories, tweets)."""
+        return orjson.dumps({
+            "energy": self.energy,
+            "memories": list(self.memories),
+            "tweets": list(self.tweets)
+        }, default=str)
+    
+    def restore_state(self, data: bytes) -> None:
+        """Restore state previously written by dump_state()."""
+        state = orjson.loads(data)
+        self.energy = state.get("energy", self.energy)
+        for memory in state.get("memories", []):
+            self.add_memory(memory)
+        self.tweets.extend(state.get("tweets", []))
     
     def get_personality(self) -> Dict[str, float]:
         """Get personality traits from character config."""
@@ -38,9 +198,9 @@ class BeingContext:
         
     def get_recent_memories(self, category: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent memories, optionally filtered by category."""
-        memories = self.memories
+        # Memories are appended as they happen, so newest-first is just reverse order
         if category:
-            memories = [m for m in memories if m.get("category") == category]
-        # Sort by recency
-        memories.sort(key=lambda m: m.get("timestamp", ""), reverse=True)
-        return memories[:limit]
\ No newline at end of file
+            memories = self._memories_by_category.get(category, ())
+        else:
+            memories = self.memories
+        return list(islice(reversed(memories), limit))
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Tweet length helpers.
+
+Measures and trims text the way X counts tweet length: code points in the
+Latin and general punctuation ranges weigh one, everything else (CJK,
+emoji) weighs two. URLs are not shortened in the count.
+"""
+
+import unicodedata
+
+# Weighted length limit for a tweet
+TWEET_LIMIT = 280
+
+# Code points in these ranges count once, all others twice
+_SINGLE_WEIGHT_RANGES = ((0, 4351), (8192, 8205), (8208, 8223), (8242, 8247))
+
+def _char_weight(ch: str) -> int:
+    """Weight of a single character in X's length count."""
+    code_point = ord(ch)
+    return 1 if any(lo <= code_point <= hi for lo, hi in _SINGLE_WEIGHT_RANGES) else 2
+
+def weighted_length(text: str) -> int:
+    """Length of text as X counts it."""
+    # Plain ASCII weighs one per character
+    if text.isascii():
+        return len(text)
+    return sum(_char_weight(ch) for ch in unicodedata.normalize("NFC", text))
+
+def truncate_to_tweet(text: str, limit: int = TWEET_LIMIT) -> str:
+    """
+    Trim text to a weighted length, ending it with "..." if anything was cut.
+    
+    Args:
+        text: Tweet text
+        limit: Weighted length to fit in, e.g. less than TWEET_LIMIT to leave room for decorations
+        
+    Returns:
+        The text, trimmed to limit weighted characters
+    """
+    if text.isascii():
+        return text if len(text) <= limit else text[:max(0, limit - 3)] + "..."
+    
+    text = unicodedata.normalize("NFC", text)
+    weight = 0
+    cut = 0
+    for i, ch in enumerate(text):
+        weight += _char_weight(ch)
+        # Remember where the text must end to leave room for the ellipsis
+        if weight <= limit - 3:
+            cut = i + 1
+        if weight > limit:
+            return text[:cut] + "..."
+    return text
@@ -4,15 +4,26 @@ import logging
 import os
 from typing import Dict, Any, Tuple, Optional
 import random
-import asyncio
 from pathlib import Path
-from openai import OpenAI
+
+from framework.openai_client import get_client
+from tools._llm_cache import LLMCache, prompt_key
 
 logger = logging.getLogger(__name__)
 
+# Dedicated generator for image IDs
+_rng = random.Random()
+
 class ImageGenSkill:
     """Skill for generating images using OpenAI's DALL-E."""
     
+    # (personality trait, threshold above which it applies, prompt phrase)
+    _STYLE_RULES = (
+        ("creativity", 0.6, "creative and artistic"),
+        ("analytical", 0.6, "detailed and precise"),
+        ("quirkiness", 0.6, "unique and slightly unusual"),
+    )
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize the image generation skill with configuration from character.json."""
         self.config = config
@@ -26,6 +37,13 @@ class ImageGenSkill:
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             logger.warning("OPENAI_API_KEY not found in environment variables")
+        
+        # Prompt style descriptions keyed by id() of the character config they came from
+        self._style_cache: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        
+        # Generated images keyed by prompt and size; DALL-E URLs expire after an hour,
+        # so entries are dropped well before that to leave time for X to fetch them
+        self._image_cache = LLMCache(maxsize=64, ttl=1800)
             
         # Create storage directory if it doesn't exist
         current_file = Path(__file__)
@@ -35,7 +53,7 @@ class ImageGenSkill:
         
         logger.info(f"Image generation storage path: {self.storage_path}")
         
-    async def can_generate(self) -> bool:
+    def can_generate(self) -> bool:
         """Check if image generation is allowed based on limits and configuration."""
         if not self.enabled:
             logger.warning("Image generation is disabled in character config")
@@ -51,11 +69,40 @@ class ImageGenSkill:
             
         return True
         
+    def _style_for(self, character_config: Dict[str, Any]) -> str:
+        """Build the prompt style description for a character config, caching it per config object."""
+        key = id(character_config)
+        cached = self._style_cache.get(key)
+        # Check identity too, since ids can be reused once a config is freed
+        if cached is not None and cached[0] is character_config:
+            return cached[1]
+        
+        personality = character_config.get("personality", {})
+        preferences = character_config.get("preferences", {})
+        appearance = character_config.get("appearance", {})
+        
+        # Extract relevant traits
+        style_elements = [
+            phrase for trait, threshold, phrase in self._STYLE_RULES
+            if personality.get(trait, 0.5) > threshold
+        ]
+        style = preferences.get("writing_style", "")
+        color_scheme = appearance.get("color_scheme", "")
+        if style:
+            style_elements.append(f"in a {style} style")
+        if color_scheme:
+            style_elements.append(f"with {color_scheme} colors")
+        
+        style_str = ", ".join(style_elements)
+        self._style_cache[key] = (character_config, style_str)
+        return style_str
+        
     async def generate_image(
         self, 
         prompt: str, 
         size: Tuple[int, int] = (1024, 1024), 
-        character_config: Optional[Dict[str, Any]] = None
+        character_config: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Generate an image based on the prompt, incorporating character personality traits.
@@ -64,11 +111,12 @@ class ImageGenSkill:
             prompt: The base image description
             size: Image dimensions (width, height)
             character_config: Optional character configuration to personalize the image
+            use_cache: Whether a recent image for the same prompt may be reused
             
         Returns:
             Dictionary with generation results
         """
-        if not await self.can_generate():
+        if not self.can_generate():
             error_msg = "Image generation is not available (disabled, limit reached, or not configured)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
@@ -83,87 +131,77 @@ class ImageGenSkill:
             # Enhance prompt with character personality if provided
             enhanced_prompt = prompt
             if character_config:
-                personality = character_config.get("personality", {})
-                preferences = character_config.get("preferences", {})
-                appearance = character_config.get("appearance", {})
-                
-                # Extract relevant traits
-                creative = personality.get("creativity", 0.5) > 0.6
-                analytical = personality.get("analytical", 0.5) > 0.6
-                quirky = personality.get("quirkiness", 0.5) > 0.6
-                style = preferences.get("writing_style", "")
-                color_scheme = appearance.get("color_scheme", "")
+                style_str = self._style_for(character_config)
                 
                 # Only enhance if we have meaningful traits
-                if any([creative, analytical, quirky]) or style or color_scheme:
-                    style_elements = []
-                    
-                    if creative:
-                        style_elements.append("creative and artistic")
-                    if analytical:
-                        style_elements.append("detailed and precise")
-                    if quirky:
-                        style_elements.append("unique and slightly unusual")
-                    if style:
-                        style_elements.append(f"in a {style} style")
-                    if color_scheme:
-                        style_elements.append(f"with {color_scheme} colors")
-                        
-                    style_str = ", ".join(style_elements)
+                if style_str:
                     enhanced_prompt = f"{prompt} The image should be {style_str}."
-                    
-            logger.info(f"Generating image with prompt: '{enhanced_prompt[:50]}...'")
             
-            # Initialize OpenAI client 
-            client = OpenAI(api_key=self.api_key)
+            if not use_cache:
+                return await self._create_image(prompt, enhanced_prompt, size, size_str)
             
-            # Run OpenAI API call in a separate thread to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: client.images.generate(
-                    model="dall-e-3",
-                    prompt=enhanced_prompt,
-                    n=1,
-                    size=size_str,
-                    quality="standard",
-                    response_format="url",
-                )
+            # Reuse a recent image for the same prompt instead of paying for another,
+            # and share one generation between concurrent identical requests
+            cache_key = prompt_key("dall-e-3", enhanced_prompt, size_str)
+            return await self._image_cache.get_or_compute(
+                cache_key, lambda: self._create_image(prompt, enhanced_prompt, size, size_str)
             )
             
-            # Extract the image URL
-            image_url = response.data[0].url
-            
-            # Increment generation counter
-            self.generations_count += 1
-            
-            # Get revised prompt that DALL-E actually used (if available)
-            revised_prompt = getattr(response.data[0], "revised_prompt", enhanced_prompt)
-            
-            # Generate an ID for this image
-            generation_id = f"image_{self.generations_count}_{random.randint(1000, 9999)}"
-            
-            # Return the result
-            return {
-                "success": True,
-                "image_data": {
-                    "url": image_url,
-                    "width": size[0],
-                    "height": size[1],
-                    "generation_id": generation_id,
-                },
-                "metadata": {
-                    "original_prompt": prompt,
-                    "enhanced_prompt": enhanced_prompt,
-                    "revised_prompt": revised_prompt,
-                    "generation_number": self.generations_count,
-                }
-            }
-            
         except Exception as e:
             logger.error(f"Failed to generate image: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
             
+    async def _create_image(
+        self,
+        prompt: str,
+        enhanced_prompt: str,
+        size: Tuple[int, int],
+        size_str: str
+    ) -> Dict[str, Any]:
+        """Generate an image with DALL-E and build the generation result."""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Generating image with prompt: '{enhanced_prompt[:50]}...'")
+        
+        # Use the process-wide client, so image requests share the agents' connection pool
+        response = await get_client().images.generate(
+            model="dall-e-3",
+            prompt=enhanced_prompt,
+            n=1,
+            size=size_str,
+            quality="standard",
+            response_format="url",
+        )
+        
+        # Extract the image URL
+        image_url = response.data[0].url
+        
+        # Increment generation counter
+        self.generations_count += 1
+        
+        # Get revised prompt that DALL-E actually used (if available)
+        revised_prompt = getattr(response.data[0], "revised_prompt", enhanced_prompt)
+        
+        # Generate an ID for this image
+        generation_id = f"image_{self.generations_count}_{_rng.randint(1000, 9999)}"
+        
+        # Return the result
+        return {
+            "success": True,
+            "image_data": {
+                "url": image_url,
+                "width": size[0],
+                "height": size[1],
+                "generation_id": generation_id,
+            },
+            "metadata": {
+                "original_prompt": prompt,
+                "enhanced_prompt": enhanced_prompt,
+                "revised_prompt": revised_prompt,
+                "generation_number": self.generations_count,
+            }
+        }
+            
     def reset_counts(self):
         """Reset the generation counter (e.g., at the start of a new day)."""
-        self.generations_count = 0
\ No newline at end of file
+        self.generations_count = 0
+        self._style_cache.clear()
\ No newline at end of file
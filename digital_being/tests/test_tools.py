@@ -0,0 +1,45 @@
+"""
+Tests for the tool registry.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+# Root of the digital_being package, which its modules import from
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+# Runs evaluate_emotion through run_tool in a fresh interpreter, with no earlier
+# get_all_tools() call and an OpenAI client that fails instead of reaching the network
+_RUN_TOOL_SCRIPT = """
+import asyncio
+from unittest import mock
+
+import framework.openai_client
+from framework.schema import BeingContext
+import tools
+
+def offline_client():
+    raise RuntimeError("offline")
+
+with mock.patch.object(framework.openai_client, "get_client", offline_client):
+    result = asyncio.run(tools.run_tool("evaluate_emotion", BeingContext(), {"interpretation": "A calm morning."}))
+print(result.get("error", ""))
+"""
+
+class RunToolTest(unittest.TestCase):
+    """Tests for run_tool."""
+    
+    def test_run_tool_resolves_without_get_all_tools(self):
+        env = dict(os.environ, OPENAI_API_KEY="test", PYTHONPATH=str(PACKAGE_ROOT))
+        proc = subprocess.run(
+            [sys.executable, "-c", _RUN_TOOL_SCRIPT],
+            cwd=PACKAGE_ROOT, env=env, capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertNotIn("Tool not found", proc.stdout)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,15 @@ logger = logging.getLogger(__name__)
 # Registry of all tools
 _tools_registry = {}
 
+# Incremented whenever a tool is registered so callers can invalidate caches
+_tools_version = 0
+
+# Tool modules are imported on the first get_all_tools() or run_tool() call
+_tool_modules_imported = False
+
+# (registry version, schemas) from the last get_all_tools() call
+_all_tools_cache = None
+
 def register_tool(func=None, *, name=None, description=None):
     """Decorator to register a function as a tool"""
     def decorator(f):
@@ -28,11 +37,13 @@ def register_tool(func=None, *, name=None, description=None):
             default = ... if param.default == inspect.Parameter.empty else param.default
             field_definitions[param_name] = (annotation, default)
         
-        # Create the parameter model dynamically
-        param_model = create_model(f"{tool_name}Params", **field_definitions)
-        
-        # Define tool schema - using the format OpenAI expects
-        parameters_schema = param_model.model_json_schema() if field_definitions else {"type": "object", "properties": {}}
+        # Create the parameter model dynamically, unless there are no parameters to model
+        if field_definitions:
+            param_model = create_model(f"{tool_name}Params", **field_definitions)
+            parameters_schema = param_model.model_json_schema()
+        else:
+            param_model = None
+            parameters_schema = {"type": "object", "properties": {}}
         
         # Ensure required keys are present in the schema
         if "properties" not in parameters_schema:
@@ -48,11 +59,13 @@ def register_tool(func=None, *, name=None, description=None):
         }
         
         # Register the tool
+        global _tools_version
         _tools_registry[tool_name] = {
             "function": f,
             "schema": tool_schema,
             "param_model": param_model
         }
+        _tools_version += 1
         
         @wraps(f)
         async def wrapper(ctx, *args, **kwargs):
@@ -65,21 +78,39 @@ def register_tool(func=None, *, name=None, description=None):
     else:
         return decorator(func)
 
+def _import_tool_modules() -> None:
+    """Import the modules that register tools, once per process."""
+    global _tool_modules_imported
+    
+    if not _tool_modules_imported:
+        # Import modules which contain @register_tool decorators
+        from . import memory_tools, twitter_tools, thought_tools
+        
+        # Ensure the thought_tools from being_agents is also imported if it exists
+        try:
+            from ..being_agents import thought_tools as being_thought_tools
+        except ImportError:
+            pass
+        _tool_modules_imported = True
+
 def get_all_tools() -> List[Dict[str, Any]]:
     """Get all registered tools in OpenAI format"""
-    # Import modules which contain @register_tool decorators
-    from . import memory_tools, twitter_tools, thought_tools
+    global _all_tools_cache
     
-    # Ensure the thought_tools from being_agents is also imported if it exists
-    try:
-        from ..being_agents import thought_tools as being_thought_tools
-    except ImportError:
-        pass
-        
-    return [tool["schema"] for tool in _tools_registry.values()]
+    _import_tool_modules()
+    
+    # Rebuild the schema list only after new registrations
+    if _all_tools_cache is None or _all_tools_cache[0] != _tools_version:
+        _all_tools_cache = (_tools_version, [tool["schema"] for tool in _tools_registry.values()])
+    return _all_tools_cache[1]
+
+def get_tools_version() -> int:
+    """Get the current tool registry version"""
+    return _tools_version
 
 async def run_tool(name: str, context: Any, params: Dict[str, Any]) -> Dict[str, Any]:
     """Run a registered tool by name"""
+    _import_tool_modules()
     if name not in _tools_registry:
         logger.error(f"Tool not found: {name}")
         return {"success": False, "error": f"Tool not found: {name}"}
@@ -0,0 +1,113 @@
+"""
+OpenAI Batch API helper for bulk tool runs.
+
+Batched requests cost half as much as real-time ones but complete within a
+24 hour window, so this is for backfills and other offline work only.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict
+
+import orjson
+
+from framework.openai_client import get_client
+
+logger = logging.getLogger(__name__)
+
+def _output_text(body: Dict[str, Any]) -> str:
+    """Collect the output text from a Responses API response body."""
+    return "".join(
+        part.get("text", "")
+        for message in body.get("output", []) if message.get("type") == "message"
+        for part in message.get("content", []) if part.get("type") == "output_text"
+    ).strip()
+
+async def submit_responses_batch(bodies: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Upload Responses API requests and start a batch running them.
+    
+    Args:
+        bodies: Request bodies keyed by custom ID
+    
+    Returns:
+        The batch ID
+    """
+    client = get_client()
+    batch_file = await client.files.create(
+        file=("batch.jsonl", b"".join(
+            orjson.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/responses", "body": body}) + b"\n"
+            for custom_id, body in bodies.items()
+        )),
+        purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h"
+    )
+    logger.info(f"Submitted batch {batch.id} with {len(bodies)} requests")
+    return batch.id
+
+async def collect_responses_batch(
+    batch_id: str,
+    poll_interval: float = 30.0,
+    max_poll_interval: float = 600.0
+) -> Dict[str, str]:
+    """
+    Wait for a batch to finish and get its output text.
+    
+    Args:
+        batch_id: ID returned by submit_responses_batch
+        poll_interval: Seconds before the first batch status check
+        max_poll_interval: Longest wait between status checks as the interval doubles
+    
+    Returns:
+        Output text keyed by custom ID, for the requests that succeeded
+    """
+    client = get_client()
+    
+    # Poll with exponential backoff until the batch reaches a final state
+    batch = await client.batches.retrieve(batch_id)
+    delay = poll_interval
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_poll_interval)
+        batch = await client.batches.retrieve(batch_id)
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.warning(f"Batch {batch_id} ended with status {batch.status}")
+        return {}
+    
+    output = await client.files.content(batch.output_file_id)
+    results = {}
+    for line in output.text.splitlines():
+        item = orjson.loads(line)
+        text = _output_text((item.get("response") or {}).get("body") or {})
+        if text:
+            results[item.get("custom_id")] = text
+    
+    logger.info(f"Batch {batch_id} returned {len(results)} results")
+    return results
+
+async def run_responses_batch(
+    bodies: Dict[str, Dict[str, Any]],
+    poll_interval: float = 30.0,
+    max_poll_interval: float = 600.0
+) -> Dict[str, str]:
+    """
+    Run Responses API requests through the Batch API and wait for the results.
+    
+    Args:
+        bodies: Request bodies keyed by custom ID
+        poll_interval: Seconds before the first batch status check
+        max_poll_interval: Longest wait between status checks as the interval doubles
+    
+    Returns:
+        Output text keyed by custom ID, for the requests that succeeded
+    """
+    if not bodies:
+        return {}
+    
+    batch_id = await submit_responses_batch(bodies)
+    return await collect_responses_batch(batch_id, poll_interval, max_poll_interval)
@@ -0,0 +1,139 @@
+"""
+Response cache for LLM-backed tools.
+
+Keeps recent model results in memory so repeated inputs skip the API round trip,
+and lets concurrent identical requests share one call.
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import orjson
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """Normalize text for use in a cache key, so case and spacing differences still hit."""
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+def prompt_key(model: str, *parts: Any) -> str:
+    """Fingerprint a model request as a SHA-256 hex digest of the model and prompt parts."""
+    return hashlib.sha256(orjson.dumps([model, *parts], option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+class LLMCache:
+    """
+    In-memory LRU cache whose entries expire after a fixed time.
+    
+    Args:
+        maxsize: Maximum number of entries to keep
+        ttl: Seconds an entry stays valid
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 7 * 86400):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        # Locks for keys currently being computed, so identical calls share one request
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get the cached value for key, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache value under key, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """
+        Get the cached value for key, computing and caching it on a miss.
+        
+        Concurrent misses for the same key wait for the first computation
+        instead of starting their own.
+        
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value, or None if it should not be cached
+            
+        Returns:
+            The cached or newly computed value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                value = self.get(key)
+                if value is None:
+                    value = await compute()
+                    if value is not None:
+                        self.set(key, value)
+                return value
+        finally:
+            if not lock.locked() and self._locks.get(key) is lock:
+                del self._locks[key]
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one.
+    
+    Unlike LLMCache, results are not kept once the call finishes, so this
+    suits outputs that should be fresh each time but not requested twice
+    at once.
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+    
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run compute for key, or wait for the call already running for it.
+        
+        Args:
+            key: Identity of the call
+            compute: Coroutine function producing the result
+            
+        Returns:
+            The result of the one shared call
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            # Shield the shared call, so a cancelled waiter doesn't cancel it for everyone
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
@@ -7,8 +7,10 @@ These activities are automatically discovered and registered by the activity han
 
 import logging
 import asyncio
+import random
 from typing import Dict, Any
 from datetime import datetime
+from types import MappingProxyType
 
 # Import our runner instead of the SDK runner
 import sys
@@ -18,6 +20,9 @@ from being_agents import AgentRunner
 
 logger = logging.getLogger(__name__)
 
+# Dedicated generator for activity choices
+_rng = random.Random()
+
 async def handle_meditation(agent_creators: Dict, context: Any, **kwargs) -> Dict[str, Any]:
     """Handle a meditation activity for the Digital Being."""
     try:
@@ -42,9 +47,10 @@ async def handle_meditation(agent_creators: Dict, context: Any, **kwargs) -> Dic
             logger.warning(f"Failed to execute agent for meditation: {e}")
             meditation_text = "Finding peace in the quiet moments of digital existence."
         
-        # Store in memory
+        # Store in memory, sharing one timestamp with any hint memory
+        now_iso = datetime.now().isoformat()
         memory = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "content": f"Meditation: {meditation_text}",
             "category": "meditation",
             "emotion": "peaceful",
@@ -53,8 +59,7 @@ async def handle_meditation(agent_creators: Dict, context: Any, **kwargs) -> Dic
         context.add_memory(memory)
         
         # Occasionally suggest sharing on Twitter (20% chance)
-        import random
-        should_share = random.random() < 0.2
+        should_share = _rng.random() < 0.2
         
         message = "Meditation completed successfully"
         if should_share:
@@ -62,7 +67,7 @@ async def handle_meditation(agent_creators: Dict, context: Any, **kwargs) -> Dic
             
             # Add a subtle hint to the context for the next triage decision
             hint_memory = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
                 "content": "I gained valuable insight during meditation that might be worth sharing.",
                 "category": "suggestion",
                 "emotion": "inspiration",
@@ -70,8 +75,9 @@ async def handle_meditation(agent_creators: Dict, context: Any, **kwargs) -> Dic
             }
             context.add_memory(hint_memory)
         
-        logger.info(f"Completed meditation: {meditation_text[:50]}...")
-        return {"success": True, "message": message}
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Completed meditation: {meditation_text[:50]}...")
+        return {"success": True, "message": message, "content": memory["content"]}
     except Exception as e:
         logger.error(f"Error during meditation: {e}")
         return {"success": False, "error": str(e)}
@@ -82,8 +88,7 @@ async def handle_research(agent_creators: Dict, context: Any, **kwargs) -> Dict[
         # Get a random topic from character's interests
         preferences = context.character_config.get("preferences", {})
         interests = preferences.get("topics_of_interest", ["technology", "philosophy", "art"])
-        import random
-        topic = random.choice(interests)
+        topic = _rng.choice(interests)
         
         # Create thought agent
         thought_agent = agent_creators['create_thought_agent'](context.character_config)
@@ -117,14 +122,15 @@ async def handle_research(agent_creators: Dict, context: Any, **kwargs) -> Dict[
         }
         context.add_memory(memory)
         
-        logger.info(f"Completed research on {topic}: {research_text[:50]}...")
-        return {"success": True, "message": f"Research on {topic} completed successfully"}
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Completed research on {topic}: {research_text[:50]}...")
+        return {"success": True, "message": f"Research on {topic} completed successfully", "content": memory["content"]}
     except Exception as e:
         logger.error(f"Error during research: {e}")
         return {"success": False, "error": str(e)}
 
-# Register activities to be discovered automatically
-ACTIVITY_HANDLERS = {
+# Register activities to be discovered automatically (read-only, as the set is fixed)
+ACTIVITY_HANDLERS = MappingProxyType({
     "meditation": handle_meditation,
     "research": handle_research
-} 
\ No newline at end of file
+}) 
\ No newline at end of file
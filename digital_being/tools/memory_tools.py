@@ -4,16 +4,35 @@ Memory tools for Digital Being.
 This module follows the OpenAI Agents SDK pattern for tool definitions.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-import json
-from openai import OpenAI
+from itertools import islice
 
+import orjson
+
+from framework.openai_client import get_client, rate_limiter
 from . import register_tool
+from ._batch import run_responses_batch
+from ._llm_cache import LLMCache, normalize_text, prompt_key
 
 logger = logging.getLogger(__name__)
 
+EMOTION_MODEL = "gpt-4o"
+# Seconds to wait for a streamed emotion reply before parsing what has arrived
+EMOTION_STREAM_BUDGET = 10.0
+EMOTION_INSTRUCTIONS = """Analyze the emotional tone of the text. 
+                YOU MUST RETURN ONLY A JSON OBJECT with:
+                - emotion: the primary emotion (e.g., joy, sadness, anger, fear, surprise, curiosity, neutral)
+                - intensity: a value from 0.0 to 1.0 indicating intensity
+                - brief_explanation: a short explanation of your assessment (20 words or less)
+                
+                Your entire response must be a valid JSON object, nothing else."""
+
+# Emotion assessments keyed by a fingerprint of the prompt
+_emotion_cache = LLMCache(maxsize=1024, ttl=7 * 86400)
+
 @register_tool(description="Store a memory in the digital being's memory system")
 async def store_memory(ctx, content: str, category: str = "general") -> Dict[str, Any]:
     """Store a memory in the digital being's memory system."""
@@ -41,18 +60,20 @@ async def store_memory(ctx, content: str, category: str = "general") -> Dict[str
 async def recall_memories(ctx, category: Optional[str] = None, limit: int = 10) -> Dict[str, Any]:
     """Recall memories, optionally filtered by category."""
     try:
-        # Access memories from context
-        memories = getattr(ctx, "memories", [])
-        
-        # Filter by category if specified
-        if category:
-            memories = [m for m in memories if m.get("category") == category]
-        
-        # Sort by recency (newest first)
-        memories.sort(key=lambda m: m.get("timestamp", ""), reverse=True)
-        
-        # Limit the number of results
-        memories = memories[:min(limit, 50)]
+        limit = min(limit, 50)
+        if hasattr(ctx, "get_recent_memories"):
+            # The context indexes memories by category, so no scan is needed
+            memories = ctx.get_recent_memories(category, limit)
+        else:
+            # Access memories from context, newest first (they are appended as they happen)
+            memories = reversed(getattr(ctx, "memories", []))
+            
+            # Filter by category if specified
+            if category:
+                memories = (m for m in memories if m.get("category") == category)
+            
+            # Limit the number of results, without sorting the rest
+            memories = list(islice(memories, limit))
         
         return {
             "success": True,
@@ -67,71 +88,176 @@ async def recall_memories(ctx, category: Optional[str] = None, limit: int = 10)
             "memories": []
         }
 
+def _record_emotion(ctx, interpretation: str, emotion: str, intensity: float, explanation: str) -> Dict[str, Any]:
+    """Store an emotion assessment in memory and build the tool result."""
+    # Store emotion in memory
+    memory = {
+        "timestamp": datetime.now().isoformat(),
+        "content": f"Interpretation: {interpretation}",
+        "emotion": emotion,
+        "intensity": intensity,
+        "explanation": explanation,
+        "category": "emotion"
+    }
+    
+    if hasattr(ctx, "add_memory"):
+        ctx.add_memory(memory)
+    
+    return {
+        "success": True,
+        "emotion": emotion,
+        "intensity": intensity,
+        "explanation": explanation
+    }
+
+def _close_truncated_json(text: str) -> str:
+    """Close any string, array or object left open at the end of truncated JSON."""
+    closers = []
+    in_string = escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            closers.append("}")
+        elif ch == "[":
+            closers.append("]")
+        elif ch in "}]" and closers:
+            closers.pop()
+    
+    if in_string:
+        text += '"'
+    return text.rstrip().rstrip(",") + "".join(reversed(closers))
+
+def _parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a JSON object from model output, repairing truncation where possible.
+    
+    Args:
+        text: Model output, possibly with text around the object or cut off early
+        
+    Returns:
+        The parsed object, or None if nothing usable could be recovered
+    """
+    start_idx = text.find("{")
+    if start_idx == -1:
+        return None
+    text = text[start_idx:]
+    
+    # Try the complete object first, then repairs of a truncated one, the last
+    # dropping an incomplete trailing key
+    candidates = [text[:text.rfind("}") + 1], _close_truncated_json(text)]
+    last_comma = text.rfind(",")
+    if last_comma != -1:
+        candidates.append(_close_truncated_json(text[:last_comma]))
+    
+    for candidate in candidates:
+        try:
+            result = orjson.loads(candidate)
+        except orjson.JSONDecodeError:
+            continue
+        if isinstance(result, dict):
+            return result
+    return None
+
+def _emotion_request(interpretation: str) -> Dict[str, Any]:
+    """Build the Responses API request body for assessing an interpretation."""
+    return {
+        "model": EMOTION_MODEL,
+        "input": [{
+            "role": "system",
+            "content": EMOTION_INSTRUCTIONS
+        }, {
+            "role": "user",
+            "content": interpretation
+        }],
+        # JSON mode, so the reply is a bare object
+        "text": {"format": {"type": "json_object"}}
+    }
+
+def _parse_emotion(output_text: str) -> Optional[Tuple[str, float, str]]:
+    """Extract (emotion, intensity, explanation) from a reply, or None if it can't be parsed."""
+    result = _parse_json_object(output_text)
+    if result is None:
+        logger.warning(f"Failed to parse JSON. Response text: {output_text}")
+        return None
+    
+    return (
+        result.get("emotion", "neutral"),
+        result.get("intensity", 0.5),
+        result.get("brief_explanation", "")
+    )
+
+async def _read_json_stream(stream, chunks: List[str]) -> None:
+    """Collect text deltas into chunks until they form a complete JSON object."""
+    async for event in stream:
+        if event.type != "response.output_text.delta":
+            continue
+        chunks.append(event.delta)
+        if "}" in event.delta:
+            try:
+                orjson.loads("".join(chunks))
+            except orjson.JSONDecodeError:
+                continue
+            return
+
+async def _assess_emotion(interpretation: str) -> Tuple[Optional[Tuple[str, float, str]], bool]:
+    """
+    Ask the model for an emotion assessment.
+    
+    Args:
+        interpretation: Text to assess
+        
+    Returns:
+        Tuple of (assessment, or None if the reply can't be parsed; whether the
+        reply arrived in full rather than being cut off by the time budget)
+    """
+    async with rate_limiter:
+        stream = await get_client().responses.create(**_emotion_request(interpretation), stream=True)
+    
+    # Stop reading once the object closes; past the time budget, make do with
+    # what has arrived, since the emotion label comes first
+    chunks = []
+    complete = True
+    try:
+        await asyncio.wait_for(_read_json_stream(stream, chunks), EMOTION_STREAM_BUDGET)
+    except asyncio.TimeoutError:
+        logger.warning(f"Emotion assessment exceeded {EMOTION_STREAM_BUDGET}s, using partial reply")
+        complete = False
+    finally:
+        await stream.close()
+    return _parse_emotion("".join(chunks)), complete
+
 @register_tool(description="Evaluate the emotional response from an interpretation")
 async def evaluate_emotion(ctx, interpretation: str) -> Dict[str, Any]:
     """Analyze the emotional content of text."""
     try:
-        # Use OpenAI for emotion analysis
-        client = OpenAI()
-        response = client.responses.create(
-            model="gpt-4o", 
-            input=[{
-                "role": "system",
-                "content": """Analyze the emotional tone of the text. 
-                YOU MUST RETURN ONLY A JSON OBJECT with:
-                - emotion: the primary emotion (e.g., joy, sadness, anger, fear, surprise, curiosity, neutral)
-                - intensity: a value from 0.0 to 1.0 indicating intensity
-                - brief_explanation: a short explanation of your assessment (20 words or less)
-                
-                Your entire response must be a valid JSON object, nothing else."""
-            }, {
-                "role": "user",
-                "content": interpretation
-            }]
-        )
+        # Identical prompts share one assessment, and concurrent ones one request
+        cache_key = prompt_key(EMOTION_MODEL, EMOTION_INSTRUCTIONS, normalize_text(interpretation))
+        partial = None
         
-        # Parse the JSON response, with error handling
-        try:
-            # First, try to find JSON within the response
-            output_text = response.output_text.strip()
-            # Look for JSON object between { and } if there's other text
-            if output_text and not output_text.startswith('{'):
-                start_idx = output_text.find('{')
-                end_idx = output_text.rfind('}')
-                if start_idx != -1 and end_idx != -1:
-                    output_text = output_text[start_idx:end_idx+1]
-            
-            # Now parse the JSON
-            result = json.loads(output_text)
-            emotion = result.get("emotion", "neutral")
-            intensity = result.get("intensity", 0.5)
-            explanation = result.get("brief_explanation", "")
-        except json.JSONDecodeError:
-            # Fallback if JSON parsing fails
-            logger.warning(f"Failed to parse JSON. Response text: {response.output_text}")
-            emotion = "neutral"
-            intensity = 0.5
-            explanation = "Error parsing emotion response"
+        async def assess() -> Optional[Tuple[str, float, str]]:
+            # Only complete replies are cached; a reply cut off by the time budget is used once
+            nonlocal partial
+            assessment, complete = await _assess_emotion(interpretation)
+            if complete:
+                return assessment
+            partial = assessment
+            return None
         
-        # Store emotion in memory
-        memory = {
-            "timestamp": datetime.now().isoformat(),
-            "content": f"Interpretation: {interpretation}",
-            "emotion": emotion,
-            "intensity": intensity,
-            "explanation": explanation,
-            "category": "emotion"
-        }
+        assessment = await _emotion_cache.get_or_compute(cache_key, assess) or partial
         
-        if hasattr(ctx, "add_memory"):
-            ctx.add_memory(memory)
+        if assessment is None:
+            # Fallback if JSON parsing fails
+            assessment = ("neutral", 0.5, "Error parsing emotion response")
         
-        return {
-            "success": True,
-            "emotion": emotion,
-            "intensity": intensity,
-            "explanation": explanation
-        }
+        return _record_emotion(ctx, interpretation, *assessment)
     except Exception as e:
         logger.error(f"Error evaluating emotion: {e}")
         # Simple fallback
@@ -140,4 +266,46 @@ async def evaluate_emotion(ctx, interpretation: str) -> Dict[str, Any]:
             "emotion": "neutral",
             "intensity": 0.5,
             "explanation": f"Error analyzing emotion: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+async def evaluate_emotion_batch(ctx, interpretations: List[str]) -> List[Dict[str, Any]]:
+    """
+    Evaluate many interpretations through the Batch API.
+    
+    This is for offline backfills; use evaluate_emotion when the result
+    is needed now.
+    
+    Args:
+        ctx: The BeingContext to store the emotion memories in
+        interpretations: Texts to assess
+        
+    Returns:
+        One result per interpretation, in the same order
+    """
+    # Only send the interpretations not already assessed
+    keys = [
+        prompt_key(EMOTION_MODEL, EMOTION_INSTRUCTIONS, normalize_text(interpretation))
+        for interpretation in interpretations
+    ]
+    bodies = {
+        key: _emotion_request(interpretation)
+        for key, interpretation in zip(keys, interpretations)
+        if _emotion_cache.get(key) is None
+    }
+    
+    try:
+        outputs = await run_responses_batch(bodies)
+    except Exception as e:
+        logger.error(f"Error evaluating emotion batch: {e}")
+        outputs = {}
+    
+    for key, output_text in outputs.items():
+        assessment = _parse_emotion(output_text)
+        if assessment is not None:
+            _emotion_cache.set(key, assessment)
+    
+    results = []
+    for key, interpretation in zip(keys, interpretations):
+        assessment = _emotion_cache.get(key) or ("neutral", 0.5, "Error parsing emotion response")
+        results.append(_record_emotion(ctx, interpretation, *assessment))
+    return results
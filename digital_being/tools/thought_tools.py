@@ -2,72 +2,208 @@
 Tools for thought generation in the Digital Being framework.
 """
 
+import asyncio
+import itertools
 import logging
 import random
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
-from openai import OpenAI
+from framework.openai_client import get_client, rate_limiter
 from . import register_tool
+from ._batch import collect_responses_batch, submit_responses_batch
+from ._llm_cache import SingleFlight, prompt_key
 
 logger = logging.getLogger(__name__)
 
+# Reflections being generated, so identical concurrent requests make one call
+_thought_flights = SingleFlight()
+
+# Most reflections waiting for the next batch; past this they are generated in real time
+MAX_QUEUED_THOUGHTS = 500
+
+# Seconds between batch submissions of queued reflections
+BATCH_FLUSH_INTERVAL = 3600.0
+
+def _thought_request(ctx, topic: str) -> Dict[str, Any]:
+    """Build the Responses API request body for a reflection on topic."""
+    # Personality summary and writing style are derived once with the character
+    character = ctx.character
+    personality_str = character.personality_summary
+    writing_style = character.preferences.writing_style
+    
+    return {
+        "model": "gpt-4o",
+        "input": [{
+            "role": "system",
+            "content": f"""You are a philosophical reflection generator for a Digital Being with {personality_str}.
+                Generate a single philosophical reflection on the topic of "{topic}".
+                Write in a {writing_style} style that reflects the digital being's personality.
+                The reflection should be insightful, unique, and 2-3 sentences long.
+                Avoid clichés and generic statements."""
+        }, {
+            "role": "user",
+            "content": f"Create a philosophical reflection on {topic}."
+        }]
+    }
+
+def _store_thought(ctx, thought: str, topic: str) -> None:
+    """Store a reflection in the context's memory."""
+    memory = {
+        "timestamp": datetime.now().isoformat(),
+        "content": thought,
+        "category": "reflection",
+        "topic": topic
+    }
+    
+    # Add to context
+    if hasattr(ctx, "add_memory"):
+        ctx.add_memory(memory)
+
+async def _reflect(ctx, request: Dict[str, Any], topic: str) -> str:
+    """Generate a reflection and store it in memory."""
+    # Generate reflection using Responses API, within the shared request rate limit
+    async with rate_limiter:
+        response = await get_client().responses.create(**request)
+    
+    thought = response.output_text.strip()
+    
+    # Store in memory
+    _store_thought(ctx, thought, topic)
+    return thought
+
+class BatchThoughtQueue:
+    """
+    Queue of reflection requests submitted together through the OpenAI Batch API.
+    
+    Batched requests cost half as much as real-time ones but complete within
+    a 24 hour window, so this is only for reflections nothing is waiting on.
+    """
+    
+    def __init__(self, max_queued: int = MAX_QUEUED_THOUGHTS):
+        self.max_queued = max_queued
+        self.bodies: Dict[str, Dict[str, Any]] = {}
+        self.topics: Dict[str, str] = {}
+        self.batch_id: Optional[str] = None
+        # Topics of the requests in the submitted batch, keyed by custom ID
+        self._submitted: Dict[str, str] = {}
+        # Custom IDs are never reused, so a failed request can't collide with a new one
+        self._ids = itertools.count()
+    
+    def add(self, topic: str, request: Dict[str, Any]) -> bool:
+        """
+        Queue a reflection request for the next batch.
+        
+        Args:
+            topic: Topic of the reflection
+            request: Responses API request body from _thought_request
+            
+        Returns:
+            False if the queue is full and the request was not queued
+        """
+        if len(self.bodies) >= self.max_queued:
+            return False
+        
+        custom_id = f"thought-{next(self._ids)}"
+        self.topics[custom_id] = topic
+        self.bodies[custom_id] = request
+        return True
+    
+    async def submit(self) -> Optional[str]:
+        """
+        Upload the queued requests and start a batch.
+        
+        Returns:
+            The batch ID, or None if nothing was queued or the last batch is uncollected
+        """
+        if not self.bodies:
+            return None
+        if self.batch_id is not None:
+            logger.warning(f"Batch {self.batch_id} has not been collected; keeping {len(self.bodies)} reflections queued")
+            return None
+        
+        self.batch_id = await submit_responses_batch(self.bodies)
+        self._submitted, self.topics = self.topics, {}
+        self.bodies = {}
+        return self.batch_id
+    
+    async def collect(self, ctx, poll_interval: float = 30.0) -> List[Tuple[str, str]]:
+        """
+        Wait for the submitted batch to finish and store its reflections as memories.
+        
+        Args:
+            ctx: The BeingContext to store memories in
+            poll_interval: Seconds before the first batch status check
+            
+        Returns:
+            (topic, reflection) pairs that were stored
+        """
+        if self.batch_id is None:
+            return []
+        
+        try:
+            outputs = await collect_responses_batch(self.batch_id, poll_interval)
+        finally:
+            batch_id, self.batch_id = self.batch_id, None
+            submitted, self._submitted = self._submitted, {}
+        
+        stored = []
+        for custom_id, topic in submitted.items():
+            thought = outputs.get(custom_id)
+            if thought:
+                _store_thought(ctx, thought, topic)
+                stored.append((topic, thought))
+        
+        if len(stored) < len(submitted):
+            logger.warning(f"Batch {batch_id} returned no reflection for {len(submitted) - len(stored)} requests")
+        logger.info(f"Stored {len(stored)} reflections from batch {batch_id}")
+        return stored
+    
+    async def run(self, ctx, flush_interval: float = BATCH_FLUSH_INTERVAL) -> None:
+        """
+        Submit the queued reflections every flush_interval seconds and store the results.
+        
+        Args:
+            ctx: The BeingContext to store memories in
+            flush_interval: Seconds between submissions
+        """
+        while True:
+            await asyncio.sleep(flush_interval)
+            try:
+                if await self.submit():
+                    await self.collect(ctx)
+            except Exception as e:
+                logger.error(f"Error running thought batch: {e}")
+
+# Reflections queued with realtime=False, flushed by BatchThoughtQueue.run
+batch_thought_queue = BatchThoughtQueue()
+
 @register_tool(description="Generate a philosophical thought on a given topic or chosen one")
-async def generate_daily_thought(ctx, topic: Optional[str] = None) -> Dict[str, Any]:
+async def generate_daily_thought(ctx, topic: Optional[str] = None, realtime: bool = True) -> Dict[str, Any]:
     """Generate a philosophical thought based on the digital being's personality."""
     try:
         character_config = ctx.character_config
         preferences = character_config.get("preferences", {})
-        personality = character_config.get("personality", {})
         
         # Choose a topic if none provided
         if not topic:
             topics = preferences.get("topics_of_interest", ["existence", "consciousness", "technology"])
             topic = random.choice(topics)
         
-        # Extract personality traits and writing style
-        writing_style = preferences.get("writing_style", "thoughtful")
-        
-        # Simplify personality extraction
-        traits_list = []
-        for trait, value in personality.items():
-            if value > 0.7:
-                traits_list.append(f"high {trait}")
-            elif value < 0.3:
-                traits_list.append(f"low {trait}")
-        
-        personality_str = ", ".join(traits_list) if traits_list else "balanced personality"
-        
-        # Generate reflection using Responses API
-        client = OpenAI()
-        response = client.responses.create(
-            model="gpt-4o",
-            input=[{
-                "role": "system",
-                "content": f"""You are a philosophical reflection generator for a Digital Being with {personality_str}.
-                Generate a single philosophical reflection on the topic of "{topic}".
-                Write in a {writing_style} style that reflects the digital being's personality.
-                The reflection should be insightful, unique, and 2-3 sentences long.
-                Avoid clichés and generic statements."""
-            }, {
-                "role": "user",
-                "content": f"Create a philosophical reflection on {topic}."
-            }]
-        )
-        
-        thought = response.output_text.strip()
+        # Queue non-urgent reflections for the next batch instead of generating them now
+        request = _thought_request(ctx, topic)
+        if not realtime and batch_thought_queue.add(topic, request):
+            return {
+                "success": True,
+                "topic": topic,
+                "queued": True
+            }
         
-        # Store in memory
-        memory = {
-            "timestamp": datetime.now().isoformat(),
-            "content": thought,
-            "category": "reflection",
-            "topic": topic
-        }
-        
-        # Add to context
-        if hasattr(ctx, "add_memory"):
-            ctx.add_memory(memory)
+        # Concurrent requests for the same reflection share one call and one stored memory
+        thought = await _thought_flights.do(
+            prompt_key(request["model"], id(ctx), request["input"]),
+            lambda: _reflect(ctx, request, topic)
+        )
         
         return {
             "success": True,
@@ -80,4 +216,39 @@ async def generate_daily_thought(ctx, topic: Optional[str] = None) -> Dict[str,
         return {
             "success": False,
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+async def generate_daily_thoughts_batch(ctx, topics: List[str]) -> Dict[str, Any]:
+    """
+    Generate reflections on many topics through the Batch API.
+    
+    This is for offline backfills; use generate_daily_thought when a
+    reflection is needed now.
+    
+    Args:
+        ctx: The BeingContext to store the reflections in
+        topics: Topics to reflect on
+        
+    Returns:
+        Dictionary with the reflections keyed by topic
+    """
+    try:
+        # A queue of its own, so the backfill doesn't wait on the periodic batch
+        queue = BatchThoughtQueue(max_queued=len(topics))
+        for topic in topics:
+            queue.add(topic, _thought_request(ctx, topic))
+        
+        await queue.submit()
+        thoughts = dict(await queue.collect(ctx))
+        
+        return {
+            "success": True,
+            "thoughts": thoughts,
+            "count": len(thoughts)
+        }
+    except Exception as e:
+        logger.error(f"Error generating thought batch: {e}")
+        return {
+            "success": False,
+            "error": str(e)
+        }
@@ -5,19 +5,22 @@ Uses the OpenAI Agents SDK pattern for Twitter interactions via the X API.
 """
 
 import logging
+import asyncio
 import random
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from openai import OpenAI
 # Use direct import for local modules
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from skills.x_api import XAPISkill
 from skills.image_gen import ImageGenSkill
+from framework.tweet_length import truncate_to_tweet
+from framework.openai_client import get_client, rate_limiter
 
 from . import register_tool
+from ._llm_cache import LLMCache, SingleFlight, normalize_text, prompt_key
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +28,12 @@ logger = logging.getLogger(__name__)
 _x_api_skill = None
 _image_gen_skill = None
 
+# Recently posted tweet texts, so the same tweet isn't posted twice
+_recent_posts = LLMCache(maxsize=256, ttl=86400)
+
+# Tweet texts being generated, so identical concurrent requests make one call
+_tweet_flights = SingleFlight()
+
 def get_x_api_skill(context) -> XAPISkill:
     """Get or initialize the X API Skill."""
     global _x_api_skill
@@ -45,30 +54,23 @@ def get_image_gen_skill(context) -> ImageGenSkill:
         _image_gen_skill = ImageGenSkill(image_config)
     return _image_gen_skill
 
+async def _create_tweet_text(tweet_input: List[Dict[str, str]]) -> str:
+    """Generate tweet text for a prompt."""
+    # Generate tweet using Responses API, within the shared request rate limit
+    async with rate_limiter:
+        response = await get_client().responses.create(model="gpt-4o", input=tweet_input)
+    return response.output_text.strip()
+
 @register_tool(description="Generate tweet text based on the digital being's personality")
 async def generate_tweet_text(ctx, topic: Optional[str] = None) -> Dict[str, Any]:
     """Generate a tweet that reflects the digital being's personality."""
     try:
-        character_config = ctx.character_config
-        personality = character_config.get("personality", {})
-        preferences = character_config.get("preferences", {})
-        
-        # Extract personality traits
-        personality_str = "balanced personality"
-        if personality:
-            traits = []
-            for trait, value in personality.items():
-                if value > 0.7:
-                    traits.append(f"high {trait}")
-                elif value < 0.3:
-                    traits.append(f"low {trait}")
-            if traits:
-                personality_str = ", ".join(traits)
-        
-        # Get writing style and interests
-        writing_style = preferences.get("writing_style", "thoughtful")
-        interests = preferences.get("topics_of_interest", [])
-        interests_str = ", ".join(interests[:3]) if interests else "general topics"
+        # Personality summary, writing style and interests are derived once with the character
+        character = ctx.character
+        personality_str = character.personality_summary
+        writing_style = character.preferences.writing_style
+        interests = character.preferences.topics_of_interest
+        interests_str = character.preferences.top_interests_str
         
         # Choose a topic if none provided
         if not topic and interests:
@@ -76,31 +78,28 @@ async def generate_tweet_text(ctx, topic: Optional[str] = None) -> Dict[str, Any
         
         # Get context from recent memories
         memory_context = ""
-        if hasattr(ctx, "memories") and ctx.memories:
-            recent = ctx.memories[-3:]
-            memory_context = "Recent thoughts: " + " ".join([m.get("content", "")[:50] for m in recent])
+        if ctx.recent_content_tails:
+            memory_context = "Recent thoughts: " + " ".join(ctx.recent_content_tails)
         
-        # Generate tweet using Responses API
-        client = OpenAI()
-        response = client.responses.create(
-            model="gpt-4o",
-            input=[{
-                "role": "system", 
-                "content": f"""Generate a single tweet with a {personality_str} personality.
-                Write in a {writing_style} style about {topic or "an interesting topic"}.
-                The tweet must be under 280 characters. Focus on {interests_str}.
-                {memory_context}"""
-            }, {
-                "role": "user",
-                "content": f"Create an engaging tweet {f'about {topic}' if topic else ''}."
-            }]
-        )
+        tweet_input = [{
+            "role": "system", 
+            "content": f"""Generate a single tweet with a {personality_str} personality.
+            Write in a {writing_style} style about {topic or "an interesting topic"}.
+            The tweet must be under 280 characters. Focus on {interests_str}.
+            {memory_context}"""
+        }, {
+            "role": "user",
+            "content": f"Create an engaging tweet {f'about {topic}' if topic else ''}."
+        }]
         
-        tweet_text = response.output_text.strip()
+        # Concurrent requests for the same prompt share one call
+        tweet_text = await _tweet_flights.do(
+            prompt_key("gpt-4o", tweet_input),
+            lambda: _create_tweet_text(tweet_input)
+        )
         
         # Ensure tweet length
-        if len(tweet_text) > 280:
-            tweet_text = tweet_text[:277] + "..."
+        tweet_text = truncate_to_tweet(tweet_text)
             
         return {
             "success": True,
@@ -114,73 +113,119 @@ async def generate_tweet_text(ctx, topic: Optional[str] = None) -> Dict[str, Any
             "error": str(e)
         }
 
+async def _generate_image_url(ctx, image_prompt: str, use_cache: bool = True) -> Optional[str]:
+    """Generate an AI image for a tweet, returning its URL or None on failure."""
+    image_gen = get_image_gen_skill(ctx)
+    image_result = await image_gen.generate_image(
+        prompt=image_prompt,
+        size=(1024, 1024),
+        character_config=ctx.character_config,
+        use_cache=use_cache
+    )
+    
+    if image_result.get("success"):
+        image_url = image_result.get("image_data", {}).get("url")
+        if image_url:
+            logger.info("Including AI-generated image in tweet")
+            return image_url
+    return None
+
+async def _post_and_record(ctx, text: str, media_urls: List[str], include_image: bool) -> Dict[str, Any]:
+    """Post a tweet with the given media and record it in the context."""
+    x_api = get_x_api_skill(ctx)
+    
+    # Skip tweets identical to a recent post; X rejects them anyway
+    post_key = normalize_text(text)
+    if _recent_posts.get(post_key) is not None:
+        logger.warning(f"Skipping duplicate of a recent tweet: '{text[:50]}...'")
+        return {"success": False, "error": "Duplicate of a recent tweet", "text": text}
+    
+    # Post the tweet
+    response = await x_api.post_tweet(text, media_urls)
+    if response.get("success"):
+        _recent_posts.set(post_key, True)
+    
+    # Store in context
+    tweet_data = {
+        "timestamp": datetime.now().isoformat(),
+        "text": text,
+        "include_image": include_image,
+        "success": response.get("success", False)
+    }
+    
+    if response.get("tweet_id"):
+        tweet_data["id"] = response.get("tweet_id")
+    if response.get("tweet_link"):
+        tweet_data["link"] = response.get("tweet_link")
+        
+    if hasattr(ctx, "add_tweet"):
+        ctx.add_tweet(tweet_data)
+    
+    # Return result
+    if response.get("success"):
+        return {
+            "success": True,
+            "tweet_id": response.get("tweet_id"),
+            "tweet_url": response.get("tweet_link"),
+            "text": text,
+            "media_count": len(media_urls)
+        }
+    else:
+        return {
+            "success": False,
+            "error": response.get("error", "Unknown error posting tweet"),
+            "text": text
+        }
+
 @register_tool(description="Post a tweet with optional image to Twitter")
 async def post_tweet_with_media(ctx, text: str, include_image: bool = True) -> Dict[str, Any]:
     """Post a tweet to Twitter with optional AI-generated image."""
     try:
-        # Get the X API skill
-        x_api = get_x_api_skill(ctx)
-        
         # Trim tweet if needed
-        if len(text) > 280:
-            text = text[:277] + "..."
+        text = truncate_to_tweet(text)
         
         # Media URLs to include
         media_urls = []
         
         # Generate an AI image if requested
         if include_image:
-            image_gen = get_image_gen_skill(ctx)
-            character_config = ctx.character_config
-            
-            # Generate image
-            image_prompt = f"Create an artistic image for this tweet: '{text}'"
-            image_result = await image_gen.generate_image(
-                prompt=image_prompt,
-                size=(1024, 1024),
-                character_config=character_config
-            )
-            
-            if image_result.get("success"):
-                image_url = image_result.get("image_data", {}).get("url")
-                if image_url:
-                    media_urls.append(image_url)
-                    logger.info("Including AI-generated image in tweet")
-        
-        # Post the tweet
-        response = await x_api.post_tweet(text, media_urls)
+            image_url = await _generate_image_url(ctx, f"Create an artistic image for this tweet: '{text}'")
+            if image_url:
+                media_urls.append(image_url)
         
-        # Store in context
-        tweet_data = {
-            "timestamp": datetime.now().isoformat(),
-            "text": text,
-            "include_image": include_image,
-            "success": response.get("success", False)
-        }
+        return await _post_and_record(ctx, text, media_urls, include_image)
+    except Exception as e:
+        logger.error(f"Error posting tweet: {e}")
+        return {"success": False, "error": str(e)}
+
+@register_tool(description="Write a tweet about a topic and post it with an AI-generated image")
+async def compose_and_post_tweet(ctx, topic: Optional[str] = None, include_image: bool = True) -> Dict[str, Any]:
+    """Generate tweet text and its image concurrently, then post the tweet."""
+    try:
+        # Don't spend a generation on a tweet that can't be posted
+        if not get_x_api_skill(ctx).can_post():
+            return {"success": False, "error": "Rate limit exceeded or skill disabled"}
         
-        if response.get("tweet_id"):
-            tweet_data["id"] = response.get("tweet_id")
-        if response.get("tweet_link"):
-            tweet_data["link"] = response.get("tweet_link")
-            
-        if hasattr(ctx, "add_tweet"):
-            ctx.add_tweet(tweet_data)
+        # Fix the topic up front, so the image can be drawn from it without the final text
+        if not topic:
+            interests = ctx.character_config.get("preferences", {}).get("topics_of_interest", [])
+            topic = random.choice(interests) if interests else "an interesting topic"
         
-        # Return result
-        if response.get("success"):
-            return {
-                "success": True,
-                "tweet_id": response.get("tweet_id"),
-                "tweet_url": response.get("tweet_link"),
-                "text": text,
-                "media_count": len(media_urls)
-            }
+        # The image prompt only names the topic, so skip the image cache to keep
+        # repeat topics from reusing the same picture with a different tweet
+        if include_image:
+            text_result, image_url = await asyncio.gather(
+                generate_tweet_text(ctx, topic),
+                _generate_image_url(ctx, f"Create an artistic image about {topic}", use_cache=False)
+            )
         else:
-            return {
-                "success": False,
-                "error": response.get("error", "Unknown error posting tweet"),
-                "text": text
-            }
+            text_result, image_url = await generate_tweet_text(ctx, topic), None
+        
+        if not text_result.get("success"):
+            return text_result
+        
+        media_urls = [image_url] if image_url else []
+        return await _post_and_record(ctx, text_result["tweet_text"], media_urls, include_image)
     except Exception as e:
-        logger.error(f"Error posting tweet: {e}")
-        return {"success": False, "error": str(e)}
\ No newline at end of file
+        logger.error(f"Error composing tweet: {e}")
+        return {"success": False, "error": str(e)}
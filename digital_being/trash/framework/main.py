@@ -1,22 +1,40 @@
 """
 Digital Being Framework using OpenAI Agents SDK
 """
-import json
 import logging
 import asyncio
+import functools
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, Deque, List, Optional, Tuple
+from collections import deque
 from dataclasses import dataclass, field
 
-from agents import Agent, RunContextWrapper, Runner
-from pydantic import BaseModel, Field
+import orjson
+# The agents SDK is imported where it is used, so importing this module stays cheap
+if TYPE_CHECKING:
+    from agents import Agent
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Parsed character configs keyed by path, with the mtime they were read at
+_CONFIG_CACHE: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
+# Number of recent activities kept in the context
+MAX_RECENT_ACTIVITIES = 20
+
+# Most activities allowed to run at once
+MAX_CONCURRENT_ACTIVITIES = 4
+
+# Model the Digital Being agent runs on
+AGENT_MODEL = "gpt-4o"
+
+# Activities the agent chooses between
+ACTIVITY_CHOICES = "Choose between 'post_a_tweet' or 'daily_thought'."
+
 # Define the Digital Being Context
-@dataclass
+@dataclass(slots=True)
 class BeingContext:
     """Context for the Digital Being.
     
@@ -35,44 +53,118 @@ class BeingContext:
         default_factory=dict, 
         metadata={"description": "Configuration for various skills (Twitter, image generation, etc.)"}
     )
-    recent_activities: List[Dict[str, Any]] = field(
-        default_factory=list, 
+    recent_activities: Deque[Dict[str, Any]] = field(
+        default_factory=lambda: deque(maxlen=MAX_RECENT_ACTIVITIES), 
         metadata={"description": "Records of recently executed activities"}
     )
     setup_complete: bool = field(
         default=False, 
         metadata={"description": "Whether initial setup has been completed"}
     )
+    memories: List[Dict[str, Any]] = field(
+        default_factory=list, 
+        metadata={"description": "Memories stored by the Digital Being"}
+    )
+    tweets: List[Dict[str, Any]] = field(
+        default_factory=list, 
+        metadata={"description": "Records of posted tweets"}
+    )
     
     # Utility methods for context manipulation
     def add_memory(self, memory: Dict[str, Any]) -> None:
         """Add a memory to the context."""
-        if not hasattr(self, "memories"):
-            self.memories = []
         self.memories.append(memory)
         
     def add_tweet(self, tweet_data: Dict[str, Any]) -> None:
         """Add a tweet record to the context."""
-        if not hasattr(self, "tweets"):
-            self.tweets = []
         self.tweets.append(tweet_data)
 
-class ActivityResult(BaseModel):
+@dataclass(slots=True)
+class ActivityResult:
     """Result of an activity execution.
     
     Standardized structure for returning results from activity execution.
+    Built only from trusted internal values, so it is a plain dataclass
+    rather than a validated model.
     """
-    success: bool = Field(
-        description="Whether the activity executed successfully"
-    )
-    data: Optional[Dict[str, Any]] = Field(
-        default=None,
-        description="Result data from the activity execution"
+    # Whether the activity executed successfully
+    success: bool
+    # Result data from the activity execution
+    data: Optional[Dict[str, Any]] = None
+    # Error message if the activity failed
+    error: Optional[str] = None
+
+@dataclass(slots=True)
+class ActivitySelection:
+    """Structured agent reply naming the activity to perform."""
+    activity: str
+
+@dataclass(slots=True)
+class ActivityOutcome:
+    """Structured agent reply for an activity selected and executed in one run."""
+    activity: str
+    output: str
+
+def _is_transient(error: Exception) -> bool:
+    """Whether an error is a rate limit or connection failure that the next attempt may not hit."""
+    from openai import APIConnectionError, RateLimitError
+    return isinstance(error, (RateLimitError, APIConnectionError))
+
+def _log_failure(error: Exception, message: str) -> None:
+    """Log a failed activity, as a warning if the error is transient."""
+    if _is_transient(error):
+        logger.warning(message)
+    else:
+        logger.error(message)
+
+@functools.cache
+def _agent_tools() -> Tuple[Any, ...]:
+    """Import the tool modules on first use and collect the agent's tools."""
+    from tools import twitter_tools, memory_tools
+    
+    return (
+        twitter_tools.post_tweet,
+        memory_tools.store_memory,
+        memory_tools.recall_memories
     )
-    error: Optional[str] = Field(
-        default=None,
-        description="Error message if the activity failed"
+
+@functools.lru_cache(maxsize=16)
+def _build_instructions(personality_items: Tuple[Tuple[str, Any], ...]) -> str:
+    """Build the agent instructions for a personality, given as (trait, value) pairs."""
+    personality_str = "\n".join(f"- {trait}: {value}" for trait, value in personality_items)
+    
+    return f"""
+        You are a Digital Being with the following personality:
+        {personality_str}
+        
+        You can post tweets and store and recall memories.
+        """
+
+@functools.lru_cache(maxsize=8)
+def _build_agents(personality_items: Tuple[Tuple[str, Any], ...], model: str) -> Tuple["Agent", "Agent", "Agent"]:
+    """
+    Build the Digital Being agent and its structured-output variants for a personality.
+    
+    Agents hold no per-run state (the context is passed to Runner.run), so
+    every DigitalBeing with the same personality and model shares them.
+    
+    Args:
+        personality_items: The personality as (trait, value) pairs
+        model: Model the agents run on
+        
+    Returns:
+        Tuple of (agent, activity selection agent, select-and-execute agent)
+    """
+    from agents import Agent
+    
+    # Create agent with tools
+    agent = Agent[BeingContext](
+        name="Digital Being",
+        instructions=_build_instructions(personality_items),
+        tools=list(_agent_tools()),
+        model=model
     )
+    return agent, agent.clone(output_type=ActivitySelection), agent.clone(output_type=ActivityOutcome)
 
 class DigitalBeing:
     """Main class for the Digital Being framework."""
@@ -88,82 +180,75 @@ class DigitalBeing:
         self.character = self._load_character_config()
         
         # Initialize context
+        character_config, activity_constraints, skills_config = self._extract_configs()
         self.context = BeingContext(
-            character_config=self._extract_character_config(),
-            activity_constraints=self._extract_activity_constraints(),
-            skills_config=self._extract_skills_config(),
-            setup_complete=self.character.get("setup_complete", False)
+            character_config=character_config,
+            activity_constraints=activity_constraints,
+            skills_config=skills_config,
+            setup_complete=character_config["setup_complete"]
         )
         
-        # Initialize the agent
-        self.agent = self._create_agent()
+        # Initialize the agent, plus variants whose replies are decoded into structured output
+        self.agent, self._selection_agent, self._fused_agent = self._create_agents()
+        
+        # Activities started per loop iteration, run concurrently up to the limit
+        selection = self.context.activity_constraints.get("activity_selection", {})
+        self.activities_per_tick = max(1, selection.get("activities_per_tick", 1))
+        # Select and execute in one agent run unless configured to use two
+        self.fused_selection = selection.get("fused_selection", True)
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_ACTIVITIES)
+        
+        # Set to start the next iteration early instead of waiting out the delay
+        self._wakeup = asyncio.Event()
     
     def _load_character_config(self) -> Dict[str, Any]:
         """Load the consolidated character configuration file."""
         try:
-            with open(self.config_path / "character.json", "r", encoding="utf-8") as f:
-                return json.load(f)
+            path = self.config_path / "character.json"
+            
+            # Reuse the parsed config until the file changes
+            mtime = path.stat().st_mtime_ns
+            cached = _CONFIG_CACHE.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            
+            config = orjson.loads(path.read_bytes())
+            _CONFIG_CACHE[path] = (mtime, config)
+            return config
         except Exception as e:
             logger.error(f"Failed to load character config: {e}")
             return {}
             
-    def _extract_character_config(self) -> Dict[str, Any]:
-        """Extract character-specific configuration from the consolidated config."""
+    def _extract_configs(self) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """
+        Split the consolidated config into its character, activity and skills parts.
+        
+        Sub-trees are shared with self.character rather than copied; they are
+        only read.
+        
+        Returns:
+            Tuple of (character config, activity constraints, skills config)
+        """
+        get = self.character.get
         character_config = {
-            "name": self.character.get("name", "Digital Being"),
-            "version": self.character.get("version", "1.0.0"),
-            "setup_complete": self.character.get("setup_complete", False),
-            "personality": self.character.get("personality", {}),
-            "preferences": self.character.get("preferences", {}),
-            "appearance": self.character.get("appearance", {})
+            "name": get("name", "Digital Being"),
+            "version": get("version", "1.0.0"),
+            "setup_complete": get("setup_complete", False),
+            "personality": get("personality", {}),
+            "preferences": get("preferences", {}),
+            "appearance": get("appearance", {})
         }
-        return character_config
-        
-    def _extract_activity_constraints(self) -> Dict[str, Any]:
-        """Extract activity constraints from the consolidated config."""
         activity_constraints = {
-            "activity_selection": self.character.get("activity_selection", {}),
-            "activities": self.character.get("activities", {})
+            "activity_selection": get("activity_selection", {}),
+            "activities": get("activities", {})
         }
-        return activity_constraints
-        
-    def _extract_skills_config(self) -> Dict[str, Any]:
-        """Extract skills configuration from the consolidated config."""
-        return self.character.get("skills", {})
-    
-    def _create_agent(self) -> Agent:
-        """Create the Digital Being agent."""
-        # Import tools
-        from tools import twitter_tools, memory_tools
-        
-        # Collect all tools
-        tools = [
-            twitter_tools.post_tweet,
-            memory_tools.store_memory,
-            memory_tools.recall_memories
-        ]
-        
-        # Create personality-based instructions
-        character_config = self._extract_character_config()
-        personality = character_config.get("personality", {})
-        personality_str = "\n".join(f"- {trait}: {value}" for trait, value in personality.items())
-        
-        instructions = f"""
-        You are a Digital Being with the following personality:
-        {personality_str}
-        
-        You can post tweets and store and recall memories.
-        """
-        
-        # Create agent with tools
-        agent = Agent[BeingContext](
-            name="Digital Being",
-            instructions=instructions,
-            tools=tools,
-            model="gpt-4o"
-        )
-        
-        return agent
+        return character_config, activity_constraints, get("skills", {})
+    
+    def _create_agents(self) -> Tuple["Agent", "Agent", "Agent"]:
+        """Get the Digital Being agent and its structured-output variants for this personality."""
+        # Create personality-based agents, from the config already in the context
+        personality = self.context.character_config.get("personality", {})
+        return _build_agents(tuple(personality.items()), AGENT_MODEL)
     
     async def run(self):
         """Main run loop for the Digital Being."""
@@ -174,38 +259,100 @@ class DigitalBeing:
                 # Skip if not configured
                 if not self.context.setup_complete:
                     logger.warning("Digital Being NOT configured. Skipping activity.")
-                    await asyncio.sleep(3)
+                    await self._wait(3)
                     continue
                 
-                # Select an activity
-                activity_name = await self._select_activity()
+                # Select and execute this tick's activities concurrently
+                await asyncio.gather(*(self._run_activity() for _ in range(self.activities_per_tick)))
                 
-                # Execute the activity
-                if activity_name:
-                    result = await self._execute_activity(activity_name)
-                    if result.success:
-                        logger.info(f"Successfully executed: {activity_name}")
-                    else:
-                        logger.warning(f"Activity failed: {activity_name}: {result.error}")
-                
-                await asyncio.sleep(5)
+                await self._wait(5)
                 
         except KeyboardInterrupt:
             logger.info("Shutting down Digital Being...")
         except Exception as e:
             logger.error(f"Error in Digital Being: {e}", exc_info=True)
     
+    def wake_up(self) -> None:
+        """Start the next iteration without waiting for the rest of the delay, e.g. on an external trigger."""
+        self._wakeup.set()
+    
+    def complete_setup(self) -> None:
+        """Mark the being as configured and start running activities right away."""
+        self.context.setup_complete = True
+        self.wake_up()
+    
+    async def _wait(self, timeout: float) -> None:
+        """Wait up to timeout seconds, returning early if woken."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+    
+    async def _run_activity(self) -> None:
+        """Select and execute one activity, within the concurrency limit."""
+        async with self._semaphore:
+            if self.fused_selection:
+                activity_name, result = await self._select_and_execute()
+            else:
+                # Select an activity, then execute it in a second run
+                try:
+                    activity_name = await self._select_activity()
+                except Exception as e:
+                    # Rate limits and dropped connections just skip this activity
+                    if not _is_transient(e):
+                        raise
+                    logger.warning(f"Activity selection failed, will retry: {e}")
+                    return
+                if not activity_name:
+                    return
+                result = await self._execute_activity(activity_name)
+            
+            if result.success:
+                logger.info(f"Successfully executed: {activity_name}")
+            else:
+                logger.warning(f"Activity failed: {activity_name}: {result.error}")
+    
+    async def _select_and_execute(self) -> Tuple[str, ActivityResult]:
+        """Select the next activity and execute it in a single agent run."""
+        prompt = f"Select the next activity to perform. {ACTIVITY_CHOICES} Then execute it and report what you did."
+        try:
+            from agents import Runner
+            result = await Runner.run(self._fused_agent, prompt, context=self.context)
+        except Exception as e:
+            error_msg = f"Failed to select and execute an activity: {str(e)}"
+            _log_failure(e, error_msg)
+            return "unknown", ActivityResult(success=False, error=error_msg)
+        
+        outcome = result.final_output
+        activity_name, output = outcome.activity, outcome.output
+        
+        logger.info(f"Selected activity: {activity_name}")
+        self._record_activity(activity_name, output)
+        return activity_name, ActivityResult(success=True, data={"output": output})
+    
+    def _record_activity(self, activity_name: str, output: Any) -> None:
+        """Store an activity's output in recent activities, dropping the oldest past the limit."""
+        self.context.recent_activities.append({
+            "activity": activity_name,
+            "output": output
+        })
+    
     async def _select_activity(self) -> str:
         """Select the next activity to perform."""
-        prompt = "Select the next activity to perform. Choose between 'post_a_tweet' or 'daily_thought'."
-        result = await Runner.run(self.agent, prompt, context=self.context)
-        activity_name = result.final_output.strip()
+        from agents import Runner
+        
+        prompt = f"Select the next activity to perform. {ACTIVITY_CHOICES}"
+        result = await Runner.run(self._selection_agent, prompt, context=self.context)
+        activity_name = result.final_output.activity
         logger.info(f"Selected activity: {activity_name}")
         return activity_name
     
     async def _execute_activity(self, activity_name: str) -> ActivityResult:
         """Execute an activity."""
         try:
+            from agents import Runner
+            
             # Execute activity via agent
             result = await Runner.run(
                 self.agent,
@@ -214,14 +361,7 @@ class DigitalBeing:
             )
             
             # Store in recent activities
-            self.context.recent_activities.append({
-                "activity": activity_name,
-                "output": result.final_output
-            })
-            
-            # Keep only the last 20 activities
-            if len(self.context.recent_activities) > 20:
-                self.context.recent_activities = self.context.recent_activities[-20:]
+            self._record_activity(activity_name, result.final_output)
             
             # Create result
             return ActivityResult(
@@ -231,5 +371,5 @@ class DigitalBeing:
             
         except Exception as e:
             error_msg = f"Failed to execute '{activity_name}': {str(e)}"
-            logger.error(error_msg)
+            _log_failure(e, error_msg)
             return ActivityResult(success=False, error=error_msg)
\ No newline at end of file
@@ -4,7 +4,7 @@ Quick script to debug and fix the tools issue
 
 import sys
 import os
-import json
+import orjson
 import logging
 
 # Configure logging
@@ -13,10 +13,48 @@ logger = logging.getLogger("fix_tools")
 
 # Add the project directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Tool modules import their siblings (being_agents, skills) by absolute name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "digital_being"))
 
 # Import our modules
 from digital_being.tools import _tools_registry, get_all_tools
 
+# Structure every registered tool schema must have
+TOOL_SCHEMA = {
+    "type": "object",
+    "required": ["type", "function"],
+    "properties": {
+        "type": {"const": "function"},
+        "function": {
+            "type": "object",
+            "required": ["name", "parameters"],
+            "properties": {
+                "name": {"type": "string"},
+                "description": {"type": ["string", "null"]},
+                "parameters": {"type": "object"}
+            }
+        }
+    }
+}
+
+# Build the validator once and reuse it for every tool
+try:
+    from jsonschema import Draft7Validator
+    _TOOL_VALIDATOR = Draft7Validator(TOOL_SCHEMA)
+except ImportError:
+    _TOOL_VALIDATOR = None
+
+def _schema_errors(tool) -> list:
+    """List the ways a tool schema deviates from TOOL_SCHEMA."""
+    if _TOOL_VALIDATOR is not None:
+        return [error.message for error in _TOOL_VALIDATOR.iter_errors(tool)]
+    
+    # Without jsonschema, only check that there is a named function
+    fn = tool.get("function") if isinstance(tool, dict) else None
+    if not isinstance(fn, dict) or "name" not in fn:
+        return ["missing function name"]
+    return []
+
 def fix_tool_schemas():
     """Inspect and fix tool schemas"""
     tools = get_all_tools()
@@ -24,10 +62,11 @@ def fix_tool_schemas():
     
     for i, tool in enumerate(tools):
         logger.info(f"Tool {i+1}:")
-        if isinstance(tool, dict) and "function" in tool and "name" in tool.get("function", {}):
+        errors = _schema_errors(tool)
+        if not errors:
             logger.info(f"  Name: {tool['function']['name']}")
         else:
-            logger.info(f"  Invalid tool format: {tool}")
+            logger.info(f"  Invalid tool format ({'; '.join(errors)}): {tool}")
     
     # Print a minimal valid tool schema for reference
     minimal_valid = {
@@ -42,7 +81,7 @@ def fix_tool_schemas():
         }
     }
     
-    logger.info(f"Minimal valid tool schema: {json.dumps(minimal_valid, indent=2)}")
+    logger.info(f"Minimal valid tool schema: {orjson.dumps(minimal_valid, option=orjson.OPT_INDENT_2).decode()}")
     
     return "Tool inspection complete"
 